@@ -27,7 +27,9 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(UserSession)
 class UserSessionAdmin(admin.ModelAdmin):
     list_display = ('user', 'ip_address', 'login_time', 'logout_time', 'is_active')
+    list_select_related = ('user',)
     list_filter = ('is_active', 'login_time')
     search_fields = ('user__username', 'ip_address')
     readonly_fields = ('session_key', 'login_time', 'logout_time')
+    raw_id_fields = ('user',)
     ordering = ('-login_time',)
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('superadmin', 'Super Administrator'), ('security', 'Security Officer'), ('it_admin', 'IT Administrator'), ('auditor', 'Auditor'), ('unlock_user', 'Unlock User')], db_index=True, default='unlock_user', help_text='User role for access control', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='usersession',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['-login_time'], name='user_sessio_login_t_ae8570_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', '-login_time'], name='user_sessio_user_id_d40ce8_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_alter_user_role_alter_usersession_is_active_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usersession',
+            name='session_key',
+            field=models.CharField(db_index=True, max_length=40),
+        ),
+    ]
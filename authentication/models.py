@@ -1,24 +1,57 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 
+class Role(models.TextChoices):
+    """
+    User roles for access control
+    """
+    SUPERADMIN = 'superadmin', _('Super Administrator')
+    SECURITY = 'security', _('Security Officer')
+    IT_ADMIN = 'it_admin', _('IT Administrator')
+    AUDITOR = 'auditor', _('Auditor')
+    UNLOCK_USER = 'unlock_user', _('Unlock User')  # For agent unlock functionality
+
+
+# Capability bits granted per role
+MANAGE_DEVICES = 1
+VIEW_FORENSICS = 2
+MANAGE_POLICIES = 4
+VIEW_ALL_SESSIONS = 8
+# Device commands
+LOCK_DEVICES = 16
+UNLOCK_DEVICES = 32
+TAKE_SCREENSHOTS = 64
+RESTART_DEVICES = 128
+
+ROLE_CAPABILITIES = {
+    Role.SUPERADMIN: (
+        MANAGE_DEVICES | VIEW_FORENSICS | MANAGE_POLICIES | VIEW_ALL_SESSIONS
+        | LOCK_DEVICES | UNLOCK_DEVICES | TAKE_SCREENSHOTS | RESTART_DEVICES
+    ),
+    Role.SECURITY: (
+        VIEW_FORENSICS | MANAGE_POLICIES | VIEW_ALL_SESSIONS
+        | LOCK_DEVICES | UNLOCK_DEVICES | TAKE_SCREENSHOTS
+    ),
+    Role.IT_ADMIN: MANAGE_DEVICES | LOCK_DEVICES | UNLOCK_DEVICES | TAKE_SCREENSHOTS | RESTART_DEVICES,
+    Role.AUDITOR: VIEW_FORENSICS | TAKE_SCREENSHOTS,
+    Role.UNLOCK_USER: 0,
+}
+
+
 class User(AbstractUser):
     """
     Custom User model with role-based access control
     """
-    ROLE_CHOICES = [
-        ('superadmin', _('Super Administrator')),
-        ('security', _('Security Officer')),
-        ('it_admin', _('IT Administrator')),
-        ('auditor', _('Auditor')),
-        ('unlock_user', _('Unlock User')),  # For agent unlock functionality
-    ]
+    ROLE_CHOICES = Role.choices
     
     role = models.CharField(
         max_length=20,
         choices=ROLE_CHOICES,
-        default='unlock_user',
+        default=Role.UNLOCK_USER,
+        db_index=True,
         help_text=_('User role for access control')
     )
     full_name = models.CharField(
@@ -49,31 +82,43 @@ class User(AbstractUser):
     
     @property
     def is_superadmin(self):
-        return self.role == 'superadmin'
+        return self.role == Role.SUPERADMIN
     
     @property
     def is_security(self):
-        return self.role == 'security'
+        return self.role == Role.SECURITY
     
     @property
     def is_it_admin(self):
-        return self.role == 'it_admin'
+        return self.role == Role.IT_ADMIN
     
     @property
     def is_auditor(self):
-        return self.role == 'auditor'
+        return self.role == Role.AUDITOR
+    
+    @cached_property
+    def capabilities(self):
+        """Capability bits granted by the user's role"""
+        return ROLE_CAPABILITIES.get(self.role, 0)
+    
+    def has_capability(self, capability):
+        return bool(self.capabilities & capability)
     
     @property
     def can_manage_devices(self):
-        return self.role in ['superadmin', 'it_admin']
+        return self.has_capability(MANAGE_DEVICES)
     
     @property
     def can_view_forensics(self):
-        return self.role in ['superadmin', 'security', 'auditor']
+        return self.has_capability(VIEW_FORENSICS)
     
     @property
     def can_manage_policies(self):
-        return self.role in ['superadmin', 'security']
+        return self.has_capability(MANAGE_POLICIES)
+    
+    @property
+    def can_view_all_sessions(self):
+        return self.has_capability(VIEW_ALL_SESSIONS)
 
 
 class UserSession(models.Model):
@@ -81,17 +126,21 @@ class UserSession(models.Model):
     Track user sessions for audit purposes
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sessions')
-    session_key = models.CharField(max_length=40, unique=True)
+    session_key = models.CharField(max_length=40, db_index=True)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField()
     login_time = models.DateTimeField(auto_now_add=True)
     logout_time = models.DateTimeField(null=True, blank=True)
-    is_active = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True, db_index=True)
     
     class Meta:
         db_table = 'user_sessions'
         verbose_name = _('User Session')
         verbose_name_plural = _('User Sessions')
+        indexes = [
+            models.Index(fields=['-login_time']),
+            models.Index(fields=['user', '-login_time']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.ip_address} ({self.login_time})"
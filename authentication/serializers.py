@@ -1,11 +1,27 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import User, UserSession
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from drf_serializer_cache import SerializerCacheMixin
+import hmac
 
 
-class UserSerializer(serializers.ModelSerializer):
+def passwords_match(password, confirmation):
+    """Constant-time comparison of a password and its confirmation"""
+    return hmac.compare_digest(password.encode(), confirmation.encode())
+
+
+def run_password_validators(field_name, password):
+    """Run AUTH_PASSWORD_VALIDATORS, reporting errors under field_name"""
+    try:
+        validate_password(password)
+    except DjangoValidationError as e:
+        raise serializers.ValidationError({field_name: list(e.messages)})
+
+
+class UserSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """
     User serializer for API responses
     """
@@ -23,7 +39,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating new users
     """
-    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
     
     class Meta:
@@ -34,17 +50,16 @@ class UserCreateSerializer(serializers.ModelSerializer):
         ]
     
     def validate(self, attrs):
-        if attrs['password'] != attrs['password_confirm']:
+        # Compare first so a mismatch skips the password validators
+        if not passwords_match(attrs['password'], attrs['password_confirm']):
             raise serializers.ValidationError("Passwords don't match")
+        run_password_validators('password', attrs['password'])
         return attrs
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        return User.objects.create_user(password=password, **validated_data)
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -84,12 +99,13 @@ class PasswordChangeSerializer(serializers.Serializer):
     Serializer for password change
     """
     old_password = serializers.CharField(required=True)
-    new_password = serializers.CharField(required=True, validators=[validate_password])
+    new_password = serializers.CharField(required=True)
     new_password_confirm = serializers.CharField(required=True)
     
     def validate(self, attrs):
-        if attrs['new_password'] != attrs['new_password_confirm']:
+        if not passwords_match(attrs['new_password'], attrs['new_password_confirm']):
             raise serializers.ValidationError("New passwords don't match")
+        run_password_validators('new_password', attrs['new_password'])
         return attrs
     
     def validate_old_password(self, value):
@@ -99,7 +115,7 @@ class PasswordChangeSerializer(serializers.Serializer):
         return value
 
 
-class UserSessionSerializer(serializers.ModelSerializer):
+class UserSessionSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """
     User session serializer
     """
@@ -1,9 +1,15 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import logout
+from django.db import transaction
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from .models import User, UserSession
 from .serializers import (
     UserSerializer, UserCreateSerializer, CustomTokenObtainPairSerializer,
@@ -11,6 +17,22 @@ from .serializers import (
 )
 
 
+class UserCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the user list (avoids deep OFFSET scans)
+    """
+    page_size = 50
+    ordering = '-created_at'
+
+
+class UserSessionCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the session audit list
+    """
+    page_size = 50
+    ordering = '-login_time'
+
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Custom JWT token obtain view with user session tracking
@@ -18,31 +40,24 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
     
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
         
-        if response.status_code == 200:
-            # Create user session record
-            user = User.objects.get(username=request.data.get('username'))
+        # Record session and last activity in a single commit
+        user = serializer.user
+        with transaction.atomic():
             UserSession.objects.create(
                 user=user,
                 session_key=request.session.session_key or '',
-                ip_address=self.get_client_ip(request),
+                ip_address=request.client_ip,
                 user_agent=request.META.get('HTTP_USER_AGENT', ''),
             )
-            
-            # Update last activity
-            user.last_activity = timezone.now()
-            user.save(update_fields=['last_activity'])
+            User.objects.filter(pk=user.pk).update(last_activity=timezone.now())
         
-        return response
-    
-    def get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
 class UserListCreateView(generics.ListCreateAPIView):
@@ -51,6 +66,7 @@ class UserListCreateView(generics.ListCreateAPIView):
     """
     queryset = User.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = UserCursorPagination
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -58,7 +74,8 @@ class UserListCreateView(generics.ListCreateAPIView):
         return UserSerializer
     
     def get_queryset(self):
-        queryset = User.objects.all()
+        # Only load the columns UserSerializer renders
+        queryset = User.objects.only(*UserSerializer.Meta.fields)
         role = self.request.query_params.get('role')
         if role:
             queryset = queryset.filter(role=role)
@@ -72,6 +89,10 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        # updated_at must stay loaded so auto_now is saved on updates
+        return User.objects.only(*UserSerializer.Meta.fields, 'updated_at')
 
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
@@ -83,6 +104,11 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    @method_decorator(cache_page(15))
+    @method_decorator(vary_on_headers('Authorization', 'Cookie'))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
 
 @api_view(['POST'])
@@ -95,8 +121,7 @@ def change_password(request):
     if serializer.is_valid():
         user = request.user
         user.set_password(serializer.validated_data['new_password'])
-        user.last_password_change = timezone.now()
-        user.save()
+        user.save(update_fields=['password'])
         
         return Response({'message': 'Password changed successfully'}, status=status.HTTP_200_OK)
     
@@ -110,17 +135,11 @@ def logout_view(request):
     Logout user and invalidate session
     """
     # Update user session
-    try:
-        session = UserSession.objects.get(
-            user=request.user,
-            session_key=request.session.session_key,
-            is_active=True
-        )
-        session.logout_time = timezone.now()
-        session.is_active = False
-        session.save()
-    except UserSession.DoesNotExist:
-        pass
+    UserSession.objects.filter(
+        user=request.user,
+        session_key=request.session.session_key,
+        is_active=True
+    ).update(logout_time=timezone.now(), is_active=False)
     
     logout(request)
     return Response({'message': 'Logged out successfully'}, status=status.HTTP_200_OK)
@@ -132,11 +151,13 @@ class UserSessionListView(generics.ListAPIView):
     """
     serializer_class = UserSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = UserSessionCursorPagination
     
     def get_queryset(self):
         # Only superadmin and security can view all sessions
         user = self.request.user
-        if user.role in ['superadmin', 'security']:
-            return UserSession.objects.all().order_by('-login_time')
+        queryset = UserSession.objects.select_related('user')
+        if user.can_view_all_sessions:
+            return queryset.order_by('-login_time')
         else:
-            return UserSession.objects.filter(user=user).order_by('-login_time')
+            return queryset.filter(user=user).order_by('-login_time')
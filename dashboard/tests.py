@@ -1,3 +1,33 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from authentication.models import User
+from devices.models import Device
+
+
+class StatusETagTests(TestCase):
+    """
+    The polled status endpoints answer 304 until the data behind them changes
+    """
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create(username='admin', role='superadmin'))
+        self.device = Device.objects.create(name='pc-1', hostname='pc-1-host')
+        self.action = self.device.restart_device(reason='test')
+    
+    def test_unchanged_state_gets_304(self):
+        for url in ('/api/system-status/', '/api/notifications/'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+    
+    def test_completed_action_changes_etag(self):
+        etag = self.client.get('/api/system-status/')['ETag']
+        created_version = self.action.updated_at
+        
+        self.action.mark_completed()
+        self.action.refresh_from_db()
+        self.assertGreater(self.action.updated_at, created_version)
+        cache.clear()  # skip the few seconds the cached counts are reused
+        
+        response = self.client.get('/api/system-status/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
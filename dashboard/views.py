@@ -2,15 +2,182 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout
 from django.urls import reverse
-from django.http import JsonResponse
+from django.core.paginator import Paginator
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_http_methods
 from django.contrib import messages
-from django.db import models
-from devices.models import Device
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Max, Q, Value, When
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Coalesce, NullIf, TruncDate
+from devices.models import Device, DeviceAction, DeviceGroup
 from events.models import Event, SecurityIncident
-from policies.models import Policy
+from forensics.models import Screenshot, AuditLog
+from policies.models import Policy, PolicyAssignment, PolicyTemplate
 from authentication.models import User
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
+import hashlib
+import json
+import uuid
+import orjson
+
+
+PENDING_ACTION_STATUSES = ['pending', 'sent', 'acknowledged']
+FAILED_ACTION_STATUSES = ['failed', 'timeout']
+
+# Dashboard counters are polled every few seconds, cache them briefly
+DASHBOARD_STATS_TIMEOUT = 5
+
+# Read-only lookup lists used by the policy assignment dialogs
+LOOKUP_LIST_CACHE_TIMEOUT = 15
+
+# Forensics totals cover a rolling window of days and change slowly
+FORENSICS_COUNTS_TIMEOUT = 60
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    JSON response encoded with orjson, which serializes datetimes and UUIDs natively
+    """
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data, option=orjson.OPT_NAIVE_UTC), **kwargs)
+
+
+def _days_ago(days):
+    """
+    Cutoff ``days`` back from now, floored to the minute so repeated requests share identical bounds
+    """
+    return (timezone.now() - timedelta(days=days)).replace(second=0, microsecond=0)
+
+
+def _start_of_day(day):
+    """
+    Aware datetime for local midnight at the start of ``day``
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _day_filter(field, day):
+    """
+    Half-open range filter on a datetime field for a local calendar day (index friendly, unlike __date)
+    """
+    start = _start_of_day(day)
+    return Q(**{f'{field}__gte': start, f'{field}__lt': start + timedelta(days=1)})
+
+
+def _compute_action_counts():
+    today = _day_filter('created_at', timezone.localdate())
+    return DeviceAction.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=today),
+        pending=Count('id', filter=Q(status__in=PENDING_ACTION_STATUSES)),
+        completed_today=Count('id', filter=today & Q(status='completed')),
+        failed_today=Count('id', filter=today & Q(status__in=FAILED_ACTION_STATUSES)),
+    )
+
+
+def _device_counts():
+    """
+    Total, online and locked device counts (single query, shared with the device_stats API)
+    """
+    return Device.objects.cached_status_counts()
+
+
+def _action_counts():
+    """
+    Device action counts used by the dashboards (single query, briefly cached)
+    """
+    return cache.get_or_set('dashboard:action_counts', _compute_action_counts, DASHBOARD_STATS_TIMEOUT)
+
+
+def _compute_forensics_counts(days):
+    cutoff_date = _days_ago(days)
+    return {
+        'screenshots': Screenshot.objects.filter(taken_at__gte=cutoff_date).count(),
+        'incidents': SecurityIncident.objects.filter(created_at__gte=cutoff_date).count(),
+        'audit_logs': AuditLog.objects.filter(timestamp__gte=cutoff_date).count(),
+    }
+
+
+def _forensics_counts(days):
+    """
+    Screenshot, incident and audit log totals for the last ``days`` days (cached for a minute)
+    """
+    return cache.get_or_set(
+        f'dashboard:forensics_counts:{days}',
+        lambda: _compute_forensics_counts(days),
+        FORENSICS_COUNTS_TIMEOUT,
+    )
+
+
+def _compute_state_version():
+    return (
+        Device.objects.aggregate(m=Max('last_seen'))['m'],
+        DeviceAction.objects.aggregate(m=Max('updated_at'))['m'],
+    )
+
+
+def _status_etag(request):
+    """
+    ETag for the polled status endpoints, built from the data they render.
+
+    Changes when device or action counts change (including devices dropping
+    offline), on heartbeats and when an action is created or updated; a poll
+    with nothing new gets a 304.
+    """
+    version = cache.get_or_set('dashboard:state_version', _compute_state_version, DASHBOARD_STATS_TIMEOUT)
+    state = (_device_counts(), _action_counts(), version)
+    return hashlib.md5(f'{request.path}:{state}'.encode()).hexdigest()
+
+
+def _stream_json_list(key, rows, extra):
+    """
+    Yield a JSON object whose ``key`` holds the streamed ``rows`` followed by ``extra``
+    """
+    yield b'{' + orjson.dumps(key) + b':['
+    first = True
+    for row in rows:
+        yield (b'' if first else b',') + orjson.dumps(row)
+        first = False
+    yield b']'
+    for name, value in extra.items():
+        yield b',' + orjson.dumps(name) + b':' + orjson.dumps(value)
+    yield b'}'
+
+
+# Uniform column set for the forensics timeline union(); each source fills the columns it has
+TIMELINE_COLUMNS = {
+    'uid': models.UUIDField,
+    'ts': models.DateTimeField,
+    'heading': models.CharField,
+    'summary': models.TextField,
+    'device_name': models.CharField,
+    'hash': models.CharField,
+    'size': models.BigIntegerField,
+    'trigger_event': models.TextField,
+    'username': models.CharField,
+    'succeeded': models.BooleanField,
+    'source_ip': models.GenericIPAddressField,
+    'level': models.CharField,
+    'state': models.CharField,
+}
+
+
+def _timeline_rows(queryset, kind, **columns):
+    """
+    Project ``queryset`` onto TIMELINE_COLUMNS, NULL-filling the columns it does not provide
+    """
+    return queryset.annotate(
+        kind=Value(kind, output_field=models.CharField())
+    ).values('kind', **{
+        name: columns.get(name, Value(None, output_field=field()))
+        for name, field in TIMELINE_COLUMNS.items()
+    }).order_by()
 
 
 @login_required
@@ -19,19 +186,16 @@ def dashboard_home(request):
     Main dashboard view
     """
     # Get basic statistics
-    total_devices = Device.objects.count()
-    online_cutoff = timezone.now() - timedelta(minutes=5)
-    online_devices = Device.objects.filter(last_seen__gte=online_cutoff).count()
-    locked_devices = Device.objects.filter(is_locked=True).count()
+    device_counts = _device_counts()
     
     recent_events = Event.objects.all()[:10]
     open_incidents = SecurityIncident.objects.filter(status='open').count()
     
     context = {
-        'total_devices': total_devices,
-        'online_devices': online_devices,
-        'locked_devices': locked_devices,
-        'offline_devices': total_devices - online_devices,
+        'total_devices': device_counts['total'],
+        'online_devices': device_counts['online'],
+        'locked_devices': device_counts['locked'],
+        'offline_devices': device_counts['total'] - device_counts['online'],
         'recent_events': recent_events,
         'open_incidents': open_incidents,
         'page_title': 'Dashboard',
@@ -55,28 +219,25 @@ def devices_dashboard(request):
     """
     Devices management dashboard
     """
-    from datetime import timedelta
-    from django.utils import timezone
-    from devices.models import DeviceAction
+    devices_list = Device.objects.select_related('owner_user').only(
+        'device_id', 'name', 'hostname', 'ip_address', 'is_locked', 'last_seen',
+        'owner_user__username', 'owner_user__full_name'
+    ).order_by('-last_seen')
     
-    devices = Device.objects.all().order_by('-last_seen')
+    # Pagination
+    paginator = Paginator(devices_list, 50)  # Show 50 devices per page
+    devices = paginator.get_page(request.GET.get('page'))
     
     # Calculate statistics
-    online_cutoff = timezone.now() - timedelta(minutes=5)
-    online_count = devices.filter(last_seen__gte=online_cutoff).count()
-    locked_count = devices.filter(is_locked=True).count()
-    
-    # Actions today
-    today = timezone.now().date()
-    actions_today = DeviceAction.objects.filter(
-        created_at__date=today
-    ).count()
+    device_counts = _device_counts()
+    action_counts = _action_counts()
     
     context = {
         'devices': devices,
-        'online_count': online_count,
-        'locked_count': locked_count,
-        'actions_today': actions_today,
+        'total_count': device_counts['total'],
+        'online_count': device_counts['online'],
+        'locked_count': device_counts['locked'],
+        'actions_today': action_counts['today'],
         'page_title': 'Device Management',
     }
     
@@ -88,11 +249,6 @@ def actions_dashboard(request):
     """
     Device actions monitoring dashboard
     """
-    from datetime import timedelta
-    from django.utils import timezone
-    from django.core.paginator import Paginator
-    from devices.models import DeviceAction
-    
     # Get all actions ordered by creation time
     actions_list = DeviceAction.objects.select_related(
         'device', 'initiated_by'
@@ -113,10 +269,9 @@ def actions_dashboard(request):
     
     date_filter = request.GET.get('date')
     if date_filter:
-        from datetime import datetime
         try:
-            filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
-            actions_list = actions_list.filter(created_at__date=filter_date)
+            filter_date = date.fromisoformat(date_filter)
+            actions_list = actions_list.filter(_day_filter('created_at', filter_date))
         except ValueError:
             pass
     
@@ -135,18 +290,7 @@ def actions_dashboard(request):
     
     # Calculate statistics
     today = timezone.now().date()
-    total_actions = DeviceAction.objects.count()
-    pending_actions = DeviceAction.objects.filter(
-        status__in=['pending', 'sent', 'acknowledged']
-    ).count()
-    completed_today = DeviceAction.objects.filter(
-        created_at__date=today,
-        status='completed'
-    ).count()
-    failed_today = DeviceAction.objects.filter(
-        created_at__date=today,
-        status__in=['failed', 'timeout']
-    ).count()
+    action_counts = _action_counts()
     
     # Get all devices for filter dropdown
     devices = Device.objects.filter(is_active=True).order_by('name')
@@ -154,10 +298,10 @@ def actions_dashboard(request):
     context = {
         'actions': actions,
         'devices': devices,
-        'total_actions': total_actions,
-        'pending_actions': pending_actions,
-        'completed_today': completed_today,
-        'failed_today': failed_today,
+        'total_actions': action_counts['total'],
+        'pending_actions': action_counts['pending'],
+        'completed_today': action_counts['completed_today'],
+        'failed_today': action_counts['failed_today'],
         'today': today.isoformat(),
         'page_title': 'Device Actions Monitor',
     }
@@ -170,16 +314,8 @@ def actions_api(request):
     """
     API endpoint for actions data (AJAX)
     """
-    from datetime import timedelta
-    from django.utils import timezone
-    from devices.models import DeviceAction
-    from django.core.serializers.json import DjangoJSONEncoder
-    import json
-    
     # Get recent actions
-    actions_list = DeviceAction.objects.select_related(
-        'device', 'initiated_by'
-    ).order_by('-created_at')[:50]
+    actions_list = DeviceAction.objects.order_by('-created_at')
     
     # Apply filters
     action_type = request.GET.get('action_type')
@@ -190,47 +326,43 @@ def actions_api(request):
     if status:
         actions_list = actions_list.filter(status=status)
     
+    actions_list = actions_list.values(
+        'id', 'device__name', 'device__hostname', 'action_type', 'status',
+        'initiated_by__username', 'created_at', 'completed_at', 'metadata'
+    )[:50]
+    
     # Convert to JSON-serializable format
-    actions_data = []
-    for action in actions_list:
-        actions_data.append({
-            'id': action.id,
-            'device_name': action.device.name if action.device.name else action.device.hostname,
-            'device_hostname': action.device.hostname,
-            'action_type': action.action_type,
-            'status': action.status,
-            'initiated_by': action.initiated_by.username if action.initiated_by else 'System',
-            'created_at': action.created_at.isoformat(),
-            'completed_at': action.completed_at.isoformat() if action.completed_at else None,
-            'error_message': action.error_message,
-            'result_data': action.result_data,
-        })
+    actions_data = (
+        {
+            'id': action['id'],
+            'device_name': action['device__name'] or action['device__hostname'],
+            'device_hostname': action['device__hostname'],
+            'action_type': action['action_type'],
+            'status': action['status'],
+            'initiated_by': action['initiated_by__username'] or 'System',
+            'created_at': action['created_at'],
+            'completed_at': action['completed_at'],
+            'error_message': action['metadata'].get('error'),
+            'result_data': action['metadata'],
+        }
+        for action in actions_list.iterator(chunk_size=200)
+    )
     
     # Calculate statistics
-    today = timezone.now().date()
-    total_actions = DeviceAction.objects.count()
-    pending_actions = DeviceAction.objects.filter(
-        status__in=['pending', 'sent', 'acknowledged']
-    ).count()
-    completed_today = DeviceAction.objects.filter(
-        created_at__date=today,
-        status='completed'
-    ).count()
-    failed_today = DeviceAction.objects.filter(
-        created_at__date=today,
-        status__in=['failed', 'timeout']
-    ).count()
-    
-    return JsonResponse({
-        'actions': actions_data,
-        'statistics': {
-            'total_actions': total_actions,
-            'pending_actions': pending_actions,
-            'completed_today': completed_today,
-            'failed_today': failed_today,
-        },
-        'timestamp': timezone.now().isoformat(),
-    })
+    action_counts = _action_counts()
+    
+    return StreamingHttpResponse(
+        _stream_json_list('actions', actions_data, {
+            'statistics': {
+                'total_actions': action_counts['total'],
+                'pending_actions': action_counts['pending'],
+                'completed_today': action_counts['completed_today'],
+                'failed_today': action_counts['failed_today'],
+            },
+            'timestamp': timezone.now(),
+        }),
+        content_type='application/json',
+    )
 
 
 @login_required 
@@ -238,8 +370,6 @@ def action_detail_api(request, action_id):
     """
     API endpoint for single action detail (AJAX)
     """
-    from devices.models import DeviceAction
-    
     try:
         action = DeviceAction.objects.select_related(
             'device', 'initiated_by'
@@ -249,78 +379,65 @@ def action_detail_api(request, action_id):
             'id': action.id,
             'device_name': action.device.name if action.device.name else action.device.hostname,
             'device_hostname': action.device.hostname,
-            'device_uuid': str(action.device.device_uuid),
+            'device_uuid': action.device.device_id,
             'action_type': action.action_type,
             'status': action.status,
             'initiated_by': action.initiated_by.username if action.initiated_by else 'System',
-            'created_at': action.created_at.isoformat(),
-            'sent_at': action.sent_at.isoformat() if action.sent_at else None,
-            'acknowledged_at': action.acknowledged_at.isoformat() if action.acknowledged_at else None,
-            'completed_at': action.completed_at.isoformat() if action.completed_at else None,
-            'error_message': action.error_message,
-            'result_data': action.result_data,
-            'parameters': action.parameters,
+            'created_at': action.created_at,
+            'completed_at': action.completed_at,
+            'error_message': action.metadata.get('error'),
+            'result_data': action.metadata,
         }
         
-        return JsonResponse(data)
+        return OrjsonResponse(data)
         
     except DeviceAction.DoesNotExist:
-        return JsonResponse({'error': 'Action not found'}, status=404)
+        return OrjsonResponse({'error': 'Action not found'}, status=404)
 
 
 @login_required
+@condition(etag_func=_status_etag)
 def system_status_api(request):
     """
     API endpoint for global system status (AJAX)
     """
-    from datetime import timedelta
-    from django.utils import timezone
-    from devices.models import DeviceAction
-    
     # Calculate real-time statistics
     now = timezone.now()
-    online_cutoff = now - timedelta(minutes=5)
     
     # Device statistics
-    total_devices = Device.objects.count()
-    online_devices = Device.objects.filter(last_seen__gte=online_cutoff).count()
-    locked_devices = Device.objects.filter(is_locked=True).count()
+    device_counts = _device_counts()
+    total_devices = device_counts['total']
+    online_devices = device_counts['online']
+    locked_devices = device_counts['locked']
     
     # Action statistics
-    today = now.date()
-    actions_today = DeviceAction.objects.filter(created_at__date=today).count()
-    pending_actions = DeviceAction.objects.filter(
-        status__in=['pending', 'sent', 'acknowledged']
-    ).count()
-    failed_actions_today = DeviceAction.objects.filter(
-        created_at__date=today,
-        status__in=['failed', 'timeout']
-    ).count()
+    action_counts = _action_counts()
     
     # Recent actions (last 10)
-    recent_actions = DeviceAction.objects.select_related(
-        'device', 'initiated_by'
-    ).order_by('-created_at')[:10]
+    recent_actions = DeviceAction.objects.order_by('-created_at').values(
+        'id', 'device__name', 'device__hostname', 'action_type', 'status',
+        'created_at', 'initiated_by__username'
+    )[:10]
     
     recent_actions_data = []
     for action in recent_actions:
         recent_actions_data.append({
-            'id': action.id,
-            'device_name': action.device.name if action.device.name else action.device.hostname,
-            'action_type': action.action_type,
-            'status': action.status,
-            'created_at': action.created_at.isoformat(),
-            'initiated_by': action.initiated_by.username if action.initiated_by else 'System',
+            'id': action['id'],
+            'device_name': action['device__name'] or action['device__hostname'],
+            'action_type': action['action_type'],
+            'status': action['status'],
+            'created_at': action['created_at'],
+            'initiated_by': action['initiated_by__username'] or 'System',
         })
     
     # System health indicators
     system_health = {
         'database_responsive': True,  # If we're here, DB is working
         'api_responsive': True,
-        'last_update': now.isoformat(),
+        'last_update': now,
     }
     
-    return JsonResponse({
+    return OrjsonResponse({
         'devices': {
             'total': total_devices,
             'online': online_devices,
@@ -329,82 +446,97 @@ def system_status_api(request):
             'unlocked': total_devices - locked_devices,
         },
         'actions': {
-            'today': actions_today,
-            'pending': pending_actions,
-            'failed_today': failed_actions_today,
+            'today': action_counts['today'],
+            'pending': action_counts['pending'],
+            'failed_today': action_counts['failed_today'],
             'recent': recent_actions_data,
         },
         'system_health': system_health,
-        'timestamp': now.isoformat(),
+        'timestamp': now,
     })
 
 
 @login_required
+@condition(etag_func=_status_etag)
 def notifications_api(request):
     """
     API endpoint for real-time notifications (AJAX)
     """
-    from datetime import timedelta
-    from django.utils import timezone
-    from devices.models import DeviceAction
-    
-    notifications = []
     now = timezone.now()
     
-    # Check for failed actions in the last 5 minutes
-    recent_failed = DeviceAction.objects.filter(
-        status__in=['failed', 'timeout'],
-        completed_at__gte=now - timedelta(minutes=5)
-    ).select_related('device')
-    
-    for action in recent_failed:
-        notifications.append({
-            'id': f'failed_action_{action.id}',
-            'type': 'error',
-            'title': 'Action Failed',
-            'message': f'{action.action_type.title()} failed on {action.device.name or action.device.hostname}',
-            'duration': 8000,
-            'timestamp': action.completed_at.isoformat() if action.completed_at else action.created_at.isoformat(),
-        })
-    
-    # Check for devices that just came online
-    recently_online = Device.objects.filter(
-        last_seen__gte=now - timedelta(minutes=2),
-        last_seen__lt=now - timedelta(seconds=30)  # Not too recent to avoid spam
+    def notification_rows(queryset, kind, timestamp, device_prefix='', action_type=None):
+        return queryset.annotate(
+            kind=Value(kind, output_field=models.CharField()),
+            ts=timestamp,
+            device_name=F(f'{device_prefix}name'),
+            device_hostname=F(f'{device_prefix}hostname'),
+            action=F('action_type') if action_type is None else Value(action_type, output_field=models.CharField()),
+        ).values('id', 'kind', 'ts', 'device_name', 'device_hostname', 'action').order_by()
+    
+    # Failed actions in the last 5 minutes
+    recent_failed = notification_rows(
+        DeviceAction.objects.filter(
+            status__in=FAILED_ACTION_STATUSES,
+            completed_at__gte=now - timedelta(minutes=5)
+        ),
+        'failed', Coalesce('completed_at', 'created_at'), device_prefix='device__',
     )
     
-    for device in recently_online:
-        notifications.append({
-            'id': f'device_online_{device.id}_{int(device.last_seen.timestamp())}',
-            'type': 'success',
-            'title': 'Device Online',
-            'message': f'{device.name or device.hostname} is now online',
-            'duration': 5000,
-            'timestamp': device.last_seen.isoformat(),
-        })
+    # Devices that just came online
+    recently_online = notification_rows(
+        Device.objects.filter(
+            last_seen__gte=now - timedelta(minutes=2),
+            last_seen__lt=now - timedelta(seconds=30)  # Not too recent to avoid spam
+        ),
+        'online', F('last_seen'), action_type='',
+    )
     
-    # Check for devices that went offline
-    recently_offline = Device.objects.filter(
-        last_seen__lt=now - timedelta(minutes=5),
-        last_seen__gte=now - timedelta(minutes=7)
+    # Devices that went offline
+    recently_offline = notification_rows(
+        Device.objects.filter(
+            last_seen__lt=now - timedelta(minutes=5),
+            last_seen__gte=now - timedelta(minutes=7)
+        ),
+        'offline', F('last_seen'), action_type='',
     )
     
-    for device in recently_offline:
-        notifications.append({
-            'id': f'device_offline_{device.id}_{int(device.last_seen.timestamp())}',
-            'type': 'warning',
-            'title': 'Device Offline',
-            'message': f'{device.name or device.hostname} went offline',
-            'duration': 6000,
-            'timestamp': device.last_seen.isoformat(),
-        })
+    # Newest first, limited in SQL to 10 notifications
+    rows = recent_failed.union(recently_online, recently_offline, all=True).order_by('-ts')[:10]
     
-    # Sort notifications by timestamp (newest first)
-    notifications.sort(key=lambda x: x['timestamp'], reverse=True)
+    notifications = []
+    for row in rows:
+        device_label = row['device_name'] or row['device_hostname']
+        if row['kind'] == 'failed':
+            notifications.append({
+                'id': f'failed_action_{row["id"]}',
+                'type': 'error',
+                'title': 'Action Failed',
+                'message': f'{row["action"].title()} failed on {device_label}',
+                'duration': 8000,
+                'timestamp': row['ts'],
+            })
+        elif row['kind'] == 'online':
+            notifications.append({
+                'id': f'device_online_{row["id"]}_{int(row["ts"].timestamp())}',
+                'type': 'success',
+                'title': 'Device Online',
+                'message': f'{device_label} is now online',
+                'duration': 5000,
+                'timestamp': row['ts'],
+            })
+        else:
+            notifications.append({
+                'id': f'device_offline_{row["id"]}_{int(row["ts"].timestamp())}',
+                'type': 'warning',
+                'title': 'Device Offline',
+                'message': f'{device_label} went offline',
+                'duration': 6000,
+                'timestamp': row['ts'],
+            })
     
-    return JsonResponse({
-        'notifications': notifications[:10],  # Limit to 10 notifications
-        'timestamp': now.isoformat(),
+    return OrjsonResponse({
+        'notifications': notifications,
+        'timestamp': now,
     })
 
 
@@ -413,10 +545,6 @@ def events_dashboard(request):
     """
     Enhanced Events monitoring dashboard with filtering and real-time updates
     """
-    from django.db.models import Q, Count
-    from datetime import datetime, timedelta
-    from django.utils import timezone
-    
     # Get filter parameters
     event_type_filter = request.GET.get('event_type', '')
     severity_filter = request.GET.get('severity', '')
@@ -428,7 +556,7 @@ def events_dashboard(request):
     
     # Apply date filter
     if days_filter > 0:
-        start_date = timezone.now() - timedelta(days=days_filter)
+        start_date = _days_ago(days_filter)
         events_queryset = events_queryset.filter(timestamp__gte=start_date)
     
     # Apply filters
@@ -441,19 +569,22 @@ def events_dashboard(request):
     if device_filter:
         events_queryset = events_queryset.filter(device_id=device_filter)
     
-    # Get filtered events
-    events = events_queryset.order_by('-timestamp')[:100]
+    # Get filtered events, loading only the columns the table renders
+    events = events_queryset.select_related('device').only(
+        'event_id', 'event_type', 'severity', 'timestamp', 'message', 'source',
+        'device', 'device__name', 'device__hostname'
+    ).order_by('-timestamp')[:100]
     
     # Get incidents
-    incidents = SecurityIncident.objects.all().order_by('-created_at')[:20]
+    incidents = SecurityIncident.objects.select_related('device').order_by('-created_at')[:20]
     
     # Statistics
-    total_events = Event.objects.count()
-    today_events = Event.objects.filter(
-        timestamp__date=timezone.now().date()
-    ).count()
-    critical_events = Event.objects.filter(severity='critical').count()
-    warning_events = Event.objects.filter(severity='warning').count()
+    event_counts = Event.objects.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=_day_filter('timestamp', timezone.localdate())),
+        critical=Count('id', filter=Q(severity='critical')),
+        warning=Count('id', filter=Q(severity='warning')),
+    )
     
     # Event type distribution
     event_types = Event.objects.values('event_type').annotate(
@@ -466,7 +597,6 @@ def events_dashboard(request):
     ).order_by('-count')
     
     # Get available devices for filter
-    from devices.models import Device
     devices = Device.objects.all()
     
     # Event type choices for filter
@@ -476,10 +606,10 @@ def events_dashboard(request):
     context = {
         'events': events,
         'incidents': incidents,
-        'total_events': total_events,
-        'today_events': today_events,
-        'critical_events': critical_events,
-        'warning_events': warning_events,
+        'total_events': event_counts['total'],
+        'today_events': event_counts['today'],
+        'critical_events': event_counts['critical'],
+        'warning_events': event_counts['warning'],
         'event_types': event_types,
         'severity_stats': severity_stats,
         'devices': devices,
@@ -495,43 +625,29 @@ def events_dashboard(request):
     return render(request, 'dashboard/events.html', context)
 
 
-@login_required
-def forensics_dashboard(request):
-    """
-    Forensics dashboard
-    """
-    from forensics.models import Screenshot, AuditLog
-    
-    recent_screenshots = Screenshot.objects.all().order_by('-taken_at')[:20]
-    audit_logs = AuditLog.objects.all().order_by('-timestamp')[:50]
-    
-    context = {
-        'screenshots': recent_screenshots,
-        'audit_logs': audit_logs,
-        'page_title': 'Forensics & Audit',
-    }
-    
-    return render(request, 'dashboard/forensics.html', context)
-
-
 @login_required
 def policies_dashboard(request):
     """
     Policies management dashboard
     """
-    from policies.models import PolicyAssignment, PolicyTemplate
-    from devices.models import DeviceGroup
-    
-    policies = Policy.objects.all().order_by('-priority', '-created_at')
+    policies = Policy.objects.annotate(
+        assignments_count=Count('assignments')
+    ).order_by('-priority', '-created_at')
     
     # Calculate statistics
-    active_policies_count = policies.filter(is_active=True).count()
-    assigned_devices_count = PolicyAssignment.objects.values('device').distinct().count()
+    policy_counts = Policy.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    assigned_devices_count = PolicyAssignment.objects.aggregate(
+        devices=Count('device', distinct=True)
+    )['devices']
     templates_count = PolicyTemplate.objects.count()
     
     context = {
         'policies': policies,
-        'active_policies_count': active_policies_count,
+        'total_policies_count': policy_counts['total'],
+        'active_policies_count': policy_counts['active'],
         'assigned_devices_count': assigned_devices_count,
         'templates_count': templates_count,
         'page_title': 'Policy Management',
@@ -545,10 +661,24 @@ def users_dashboard(request):
     """
     User management dashboard
     """
-    users = User.objects.all().order_by('-created_at')
+    users_list = User.objects.only(
+        'username', 'full_name', 'email', 'role', 'is_active', 'is_superuser',
+        'last_login', 'created_at'
+    ).order_by('-created_at')
+    
+    # Pagination
+    paginator = Paginator(users_list, 50)  # Show 50 users per page
+    users = paginator.get_page(request.GET.get('page'))
+    
+    user_counts = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
     
     context = {
         'users': users,
+        'total_users': user_counts['total'],
+        'active_users': user_counts['active'],
         'page_title': 'User Management',
     }
     
@@ -556,17 +686,16 @@ def users_dashboard(request):
 
 
 # API Views for Policy Management
-from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
-import json
-
 @login_required
+@cache_page(LOOKUP_LIST_CACHE_TIMEOUT)
 def api_policies_list(request):
     """
     API endpoint for listing policies
     """
     if request.method == 'GET':
-        policies = Policy.objects.all().order_by('-priority', '-created_at')
+        policies = Policy.objects.annotate(
+            assignments_count=Count('assignments')
+        ).order_by('-priority', '-created_at')
         policies_data = []
         
         for policy in policies:
@@ -577,12 +706,12 @@ def api_policies_list(request):
                 'scope': policy.scope,
                 'priority': policy.priority,
                 'is_active': policy.is_active,
-                'assignments_count': policy.assignments.count(),
-                'created_at': policy.created_at.isoformat(),
-                'updated_at': policy.updated_at.isoformat(),
+                'assignments_count': policy.assignments_count,
+                'created_at': policy.created_at,
+                'updated_at': policy.updated_at,
             })
         
-        return JsonResponse({'success': True, 'policies': policies_data})
+        return OrjsonResponse({'success': True, 'policies': policies_data})
     
     elif request.method == 'POST':
         try:
@@ -620,19 +749,19 @@ def api_policies_list(request):
                 created_by=request.user
             )
             
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': True, 
                 'message': 'Policy created successfully',
                 'policy_id': policy.id
             })
             
         except Exception as e:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False, 
                 'error': str(e)
             }, status=400)
     
-    return JsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
+    return OrjsonResponse({'success': False, 'error': 'Method not allowed'}, status=405)
 
 
 @login_required
@@ -752,45 +881,51 @@ def api_policy_detail(request, policy_id):
 
 
 @login_required
+@cache_page(LOOKUP_LIST_CACHE_TIMEOUT)
 def api_devices_list(request):
     """
     API endpoint for listing devices for policy assignment
     """
-    devices = Device.objects.all().order_by('hostname')
-    devices_data = []
-    
-    for device in devices:
-        devices_data.append({
-            'id': device.id,
-            'name': device.name or device.hostname,
-            'hostname': device.hostname,
-            'is_online': device.is_online,
-            'operating_system': device.operating_system,
-            'last_seen': device.last_seen.isoformat() if device.last_seen else None,
-        })
+    online_cutoff = timezone.now() - timedelta(minutes=5)
+    devices = Device.objects.order_by('hostname').values(
+        'id', 'hostname', 'last_seen',
+        display_name=Coalesce(NullIf('name', Value('')), 'hostname'),
+        online=Case(
+            When(last_seen__gt=online_cutoff, then=Value(True)),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        ),
+        operating_system=F('os_version'),
+    )
     
-    return JsonResponse(devices_data, safe=False)
+    devices_data = [
+        {
+            'id': device['id'],
+            'name': device['display_name'],
+            'hostname': device['hostname'],
+            'is_online': device['online'],
+            'operating_system': device['operating_system'],
+            'last_seen': device['last_seen'],
+        }
+        for device in devices
+    ]
+    
+    return OrjsonResponse(devices_data)
 
 
 @login_required
+@cache_page(LOOKUP_LIST_CACHE_TIMEOUT)
 def api_device_groups_list(request):
     """
     API endpoint for listing device groups for policy assignment
     """
-    from devices.models import DeviceGroup
-    
-    groups = DeviceGroup.objects.all().order_by('name')
-    groups_data = []
-    
-    for group in groups:
-        groups_data.append({
-            'id': group.id,
-            'name': group.name,
-            'description': group.description,
-            'device_count': group.devices.count(),
-        })
+    groups_data = list(
+        DeviceGroup.objects.order_by('name').values(
+            'id', 'name', 'description', device_count=Count('devices')
+        )
+    )
     
-    return JsonResponse(groups_data, safe=False)
+    return OrjsonResponse(groups_data)
 
 
 @login_required
@@ -798,9 +933,6 @@ def api_policy_assignments(request):
     """
     API endpoint for managing policy assignments
     """
-    from policies.models import PolicyAssignment
-    from devices.models import DeviceGroup
-    
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
@@ -810,26 +942,31 @@ def api_policy_assignments(request):
             
             policy = Policy.objects.get(id=policy_id)
             
-            # Clear existing assignments for this policy
-            PolicyAssignment.objects.filter(policy=policy).delete()
+            # Validate every target up front with one query per model
+            valid_device_ids = set(
+                Device.objects.filter(id__in=device_ids).values_list('id', flat=True)
+            )
+            if len(valid_device_ids) != len(set(device_ids)):
+                raise Device.DoesNotExist('Device matching query does not exist.')
+            
+            valid_group_ids = set(
+                DeviceGroup.objects.filter(id__in=group_ids).values_list('id', flat=True)
+            )
+            if len(valid_group_ids) != len(set(group_ids)):
+                raise DeviceGroup.DoesNotExist('DeviceGroup matching query does not exist.')
             
-            # Create device assignments
-            for device_id in device_ids:
-                device = Device.objects.get(id=device_id)
-                PolicyAssignment.objects.create(
-                    policy=policy,
-                    device=device,
-                    assigned_by=request.user
-                )
+            assignments = [
+                PolicyAssignment(policy=policy, device_id=device_id, assigned_by=request.user)
+                for device_id in valid_device_ids
+            ] + [
+                PolicyAssignment(policy=policy, device_group_id=group_id, assigned_by=request.user)
+                for group_id in valid_group_ids
+            ]
             
-            # Create group assignments
-            for group_id in group_ids:
-                group = DeviceGroup.objects.get(id=group_id)
-                PolicyAssignment.objects.create(
-                    policy=policy,
-                    device_group=group,
-                    assigned_by=request.user
-                )
+            # Replace existing assignments for this policy
+            with transaction.atomic():
+                PolicyAssignment.objects.filter(policy=policy).delete()
+                PolicyAssignment.objects.bulk_create(assignments, batch_size=500)
             
             return JsonResponse({
                 'success': True, 
@@ -850,35 +987,31 @@ def forensics_dashboard(request):
     """
     Digital forensics investigation dashboard
     """
-    from forensics.models import Screenshot, AuditLog
-    from events.models import SecurityIncident
-    from datetime import timedelta
-    from django.utils import timezone
-    from django.db.models import Count
-    
     # Get days filter from request
     days_filter = int(request.GET.get('days', 7))
-    cutoff_date = timezone.now() - timedelta(days=days_filter)
+    cutoff_date = _days_ago(days_filter)
     
     # Get statistics
-    total_screenshots = Screenshot.objects.filter(taken_at__gte=cutoff_date).count()
-    total_incidents = SecurityIncident.objects.filter(created_at__gte=cutoff_date).count()
-    total_audit_logs = AuditLog.objects.filter(timestamp__gte=cutoff_date).count()
+    forensics_counts = _forensics_counts(days_filter)
     
     # Get recent screenshots for display
-    recent_screenshots = Screenshot.objects.select_related('device').filter(
+    recent_screenshots = Screenshot.objects.select_related('device').only(
+        'screenshot_id', 'taken_at', 'file_hash', 'device__name'
+    ).filter(
         taken_at__gte=cutoff_date
     ).order_by('-taken_at')[:12]
     
     # Get recent incidents
-    recent_incidents = SecurityIncident.objects.filter(
+    recent_incidents = SecurityIncident.objects.select_related('device').only(
+        'title', 'severity', 'created_at', 'device__name'
+    ).filter(
         created_at__gte=cutoff_date
     ).order_by('-created_at')[:10]
     
     context = {
-        'total_screenshots': total_screenshots,
-        'total_incidents': total_incidents,
-        'total_audit_logs': total_audit_logs,
+        'total_screenshots': forensics_counts['screenshots'],
+        'total_incidents': forensics_counts['incidents'],
+        'total_audit_logs': forensics_counts['audit_logs'],
         'recent_screenshots': recent_screenshots,
         'recent_incidents': recent_incidents,
         'days_filter': days_filter,
@@ -893,10 +1026,6 @@ def api_forensics_screenshots(request):
     """
     API endpoint for forensics screenshots with filtering and pagination
     """
-    from forensics.models import Screenshot
-    from django.core.paginator import Paginator
-    import json
-    
     # Get query parameters
     page = int(request.GET.get('page', 1))
     limit = int(request.GET.get('limit', 20))
@@ -904,12 +1033,14 @@ def api_forensics_screenshots(request):
     days = int(request.GET.get('days', 7))
     
     # Build query
-    queryset = Screenshot.objects.select_related('device')
+    queryset = Screenshot.objects.values(
+        'screenshot_id', 'taken_at', 'file_hash', 'file_size', 'image_file',
+        'device__device_id', 'device__name',
+        trigger_event=KeyTextTransform('trigger_event', 'metadata'),
+    )
     
     # Filter by time range
-    from datetime import timedelta
-    from django.utils import timezone
-    cutoff_date = timezone.now() - timedelta(days=days)
+    cutoff_date = _days_ago(days)
     queryset = queryset.filter(taken_at__gte=cutoff_date)
     
     # Filter by device if specified
@@ -924,21 +1055,22 @@ def api_forensics_screenshots(request):
     screenshots_page = paginator.get_page(page)
     
     # Serialize data
+    image_storage = Screenshot._meta.get_field('image_file').storage
     screenshots_data = []
     for screenshot in screenshots_page:
         screenshots_data.append({
-            'id': str(screenshot.screenshot_id),
-            'device_id': str(screenshot.device.device_id) if screenshot.device else None,
-            'device_name': screenshot.device.name if screenshot.device else 'Unknown Device',
-            'taken_at': screenshot.taken_at.isoformat(),
-            'file_hash': screenshot.file_hash,
-            'file_size': screenshot.file_size,
-            'trigger_event': screenshot.metadata.get('trigger_event', 'Unknown') if screenshot.metadata else 'Unknown',
+            'id': screenshot['screenshot_id'],
+            'device_id': screenshot['device__device_id'],
+            'device_name': screenshot['device__name'] if screenshot['device__device_id'] else 'Unknown Device',
+            'taken_at': screenshot['taken_at'],
+            'file_hash': screenshot['file_hash'],
+            'file_size': screenshot['file_size'],
+            'trigger_event': screenshot['trigger_event'] or 'Unknown',
             'thumbnail_url': None,  # Could implement thumbnail generation
-            'image_url': screenshot.image_file.url if screenshot.image_file else None,
+            'image_url': image_storage.url(screenshot['image_file']) if screenshot['image_file'] else None,
         })
     
-    return JsonResponse({
+    return OrjsonResponse({
         'screenshots': screenshots_data,
         'pagination': {
             'current_page': page,
@@ -955,24 +1087,33 @@ def api_forensics_audit_logs(request):
     """
     API endpoint for forensics audit logs
     """
-    from forensics.models import AuditLog
-    from django.core.paginator import Paginator
-    import json
-    
     # Get query parameters
-    page = int(request.GET.get('page', 1))
     limit = int(request.GET.get('limit', 50))
     device_id = request.GET.get('device_id')
     action_type = request.GET.get('action_type')
     days = int(request.GET.get('days', 7))
-    
-    # Build query
-    queryset = AuditLog.objects.select_related('actor_user', 'target')
+    include_details = request.GET.get('include_details') == '1'
+    before = request.GET.get('before')
+    before_id = request.GET.get('before_id')
+    
+    # Build query, fetching the details JSON only when asked for
+    fields = [
+        'log_id', 'timestamp', 'action', 'target', 'target_id', 'ip_address', 'success',
+        'actor_user__username'
+    ]
+    if include_details:
+        fields.append('details')
+    queryset = AuditLog.objects.values(
+        *fields,
+        targets_device=Case(
+            When(target__contains='Device', then=Value(True)),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        ),
+    )
     
     # Filter by time range
-    from datetime import timedelta
-    from django.utils import timezone
-    cutoff_date = timezone.now() - timedelta(days=days)
+    cutoff_date = _days_ago(days)
     queryset = queryset.filter(timestamp__gte=cutoff_date)
     
     # Filter by device if specified (through target field)
@@ -983,37 +1124,57 @@ def api_forensics_audit_logs(request):
     if action_type:
         queryset = queryset.filter(action=action_type)
     
-    # Order by most recent
-    queryset = queryset.order_by('-timestamp')
+    # Keyset pagination: continue after the (timestamp, log_id) of the previous page's last row
+    if before:
+        try:
+            cursor_ts = datetime.fromisoformat(before)
+            cursor_id = uuid.UUID(before_id) if before_id else None
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        if timezone.is_naive(cursor_ts):
+            cursor_ts = timezone.make_aware(cursor_ts)
+        if cursor_id:
+            queryset = queryset.filter(
+                Q(timestamp__lt=cursor_ts) | Q(timestamp=cursor_ts, log_id__lt=cursor_id)
+            )
+        else:
+            queryset = queryset.filter(timestamp__lt=cursor_ts)
     
-    # Paginate
-    paginator = Paginator(queryset, limit)
-    logs_page = paginator.get_page(page)
+    # Order by most recent, fetching one extra row to know whether another page follows
+    logs = list(queryset.order_by('-timestamp', '-log_id')[:limit + 1])
+    has_next = len(logs) > limit
+    logs = logs[:limit]
     
     # Serialize data
     logs_data = []
-    for log in logs_page:
-        logs_data.append({
-            'id': str(log.log_id),
-            'timestamp': log.timestamp.isoformat(),
-            'action_type': log.action,
-            'description': f"{log.action.replace('_', ' ').title()} - {log.target}",
-            'user': log.actor_user.username if log.actor_user else 'System',
-            'device_id': log.target_id if 'Device' in log.target else None,
-            'device_name': log.target if 'Device' in log.target else None,
-            'ip_address': log.ip_address,
-            'success': log.success,
-            'details': log.details,
-        })
+    for log in logs:
+        log_data = {
+            'id': log['log_id'],
+            'timestamp': log['timestamp'],
+            'action_type': log['action'],
+            'description': f"{log['action'].replace('_', ' ').title()} - {log['target']}",
+            'user': log['actor_user__username'] or 'System',
+            'device_id': log['target_id'] if log['targets_device'] else None,
+            'device_name': log['target'] if log['targets_device'] else None,
+            'ip_address': log['ip_address'],
+            'success': log['success'],
+        }
+        if include_details:
+            log_data['details'] = log['details']
+        logs_data.append(log_data)
+    
+    next_cursor = None
+    if has_next:
+        next_cursor = {
+            'before': logs[-1]['timestamp'].isoformat(),
+            'before_id': str(logs[-1]['log_id']),
+        }
     
-    return JsonResponse({
+    return OrjsonResponse({
         'audit_logs': logs_data,
         'pagination': {
-            'current_page': page,
-            'total_pages': paginator.num_pages,
-            'total_items': paginator.count,
-            'has_next': logs_page.has_next(),
-            'has_previous': logs_page.has_previous(),
+            'has_next': has_next,
+            'next_cursor': next_cursor,
         }
     })
 
@@ -1023,10 +1184,6 @@ def api_forensics_incidents(request):
     """
     API endpoint for forensics security incidents
     """
-    from events.models import SecurityIncident
-    from django.core.paginator import Paginator
-    import json
-    
     # Get query parameters
     page = int(request.GET.get('page', 1))
     limit = int(request.GET.get('limit', 20))
@@ -1035,12 +1192,13 @@ def api_forensics_incidents(request):
     days = int(request.GET.get('days', 30))
     
     # Build query
-    queryset = SecurityIncident.objects.select_related('device', 'assigned_to')
+    queryset = SecurityIncident.objects.values(
+        'incident_id', 'title', 'description', 'severity', 'status', 'created_at', 'updated_at',
+        'incident_type', 'device__name', 'assigned_to__username'
+    )
     
     # Filter by time range
-    from datetime import timedelta
-    from django.utils import timezone
-    cutoff_date = timezone.now() - timedelta(days=days)
+    cutoff_date = _days_ago(days)
     queryset = queryset.filter(created_at__gte=cutoff_date)
     
     # Filter by severity if specified
@@ -1062,19 +1220,19 @@ def api_forensics_incidents(request):
     incidents_data = []
     for incident in incidents_page:
         incidents_data.append({
-            'id': str(incident.incident_id),
-            'title': incident.title,
-            'description': incident.description,
-            'severity': incident.severity,
-            'status': incident.status,
-            'created_at': incident.created_at.isoformat(),
-            'updated_at': incident.updated_at.isoformat(),
-            'device': incident.device.name if incident.device else None,
-            'assigned_to': incident.assigned_to.username if incident.assigned_to else None,
-            'incident_type': incident.incident_type,
+            'id': incident['incident_id'],
+            'title': incident['title'],
+            'description': incident['description'],
+            'severity': incident['severity'],
+            'status': incident['status'],
+            'created_at': incident['created_at'],
+            'updated_at': incident['updated_at'],
+            'device': incident['device__name'],
+            'assigned_to': incident['assigned_to__username'],
+            'incident_type': incident['incident_type'],
         })
     
-    return JsonResponse({
+    return OrjsonResponse({
         'incidents': incidents_data,
         'pagination': {
             'current_page': page,
@@ -1091,86 +1249,76 @@ def api_forensics_timeline(request):
     """
     API endpoint for forensics timeline combining screenshots, audit logs, and incidents
     """
-    from forensics.models import Screenshot, AuditLog
-    from events.models import SecurityIncident
-    from datetime import timedelta
-    from django.utils import timezone
-    import json
-    
     # Get query parameters
     days = int(request.GET.get('days', 7))
     limit = int(request.GET.get('limit', 50))
     
     # Filter by time range
-    cutoff_date = timezone.now() - timedelta(days=days)
+    cutoff_date = _days_ago(days)
+    
+    # One UNION ALL across the three evidence tables, sorted and limited in SQL
+    screenshots = _timeline_rows(
+        Screenshot.objects.filter(taken_at__gte=cutoff_date), 'screenshot',
+        uid=F('screenshot_id'), ts=F('taken_at'), device_name=F('device__name'),
+        hash=F('file_hash'), size=F('file_size'),
+        trigger_event=KeyTextTransform('trigger_event', 'metadata'),
+    )
+    audit_logs = _timeline_rows(
+        AuditLog.objects.filter(timestamp__gte=cutoff_date), 'audit_log',
+        uid=F('log_id'), ts=F('timestamp'), heading=F('action'), summary=F('target'),
+        username=F('actor_user__username'), succeeded=F('success'), source_ip=F('ip_address'),
+    )
+    incidents = _timeline_rows(
+        SecurityIncident.objects.filter(created_at__gte=cutoff_date), 'incident',
+        uid=F('incident_id'), ts=F('created_at'), heading=F('title'), summary=F('description'),
+        device_name=F('device__name'), level=F('severity'), state=F('status'),
+    )
+    rows = screenshots.union(audit_logs, incidents, all=True).order_by('-ts')[:limit]
     
     timeline_events = []
+    for row in rows.iterator(chunk_size=200):
+        if row['kind'] == 'screenshot':
+            timeline_events.append({
+                'id': f"screenshot_{row['uid']}",
+                'type': 'screenshot',
+                'title': f"Screenshot captured on {row['device_name'] or 'Unknown Device'}",
+                'description': f"Triggered by: {row['trigger_event'] or 'Unknown'}",
+                'timestamp': row['ts'],
+                'device': row['device_name'],
+                'metadata': {
+                    'file_hash': row['hash'],
+                    'file_size': row['size'],
+                }
+            })
+        elif row['kind'] == 'audit_log':
+            timeline_events.append({
+                'id': f"audit_{row['uid']}",
+                'type': 'audit_log',
+                'title': row['heading'].replace('_', ' ').title(),
+                'description': row['summary'],
+                'timestamp': row['ts'],
+                'device': row['summary'] if 'Device' in row['summary'] else None,
+                'metadata': {
+                    'user': row['username'] or 'System',
+                    'success': row['succeeded'],
+                    'ip_address': row['source_ip'],
+                }
+            })
+        else:
+            timeline_events.append({
+                'id': f"incident_{row['uid']}",
+                'type': 'incident',
+                'title': row['heading'],
+                'description': row['summary'],
+                'timestamp': row['ts'],
+                'device': row['device_name'],
+                'metadata': {
+                    'severity': row['level'],
+                    'status': row['state'],
+                }
+            })
     
-    # Add screenshots to timeline
-    screenshots = Screenshot.objects.select_related('device').filter(
-        taken_at__gte=cutoff_date
-    ).order_by('-taken_at')[:limit//3]
-    
-    for screenshot in screenshots:
-        timeline_events.append({
-            'id': f"screenshot_{screenshot.screenshot_id}",
-            'type': 'screenshot',
-            'title': f"Screenshot captured on {screenshot.device.name if screenshot.device else 'Unknown Device'}",
-            'description': f"Triggered by: {screenshot.metadata.get('trigger_event', 'Unknown') if screenshot.metadata else 'Unknown'}",
-            'timestamp': screenshot.taken_at.isoformat(),
-            'device': screenshot.device.name if screenshot.device else None,
-            'metadata': {
-                'file_hash': screenshot.file_hash,
-                'file_size': screenshot.file_size,
-            }
-        })
-    
-    # Add audit logs to timeline
-    audit_logs = AuditLog.objects.select_related('actor_user').filter(
-        timestamp__gte=cutoff_date
-    ).order_by('-timestamp')[:limit//3]
-    
-    for log in audit_logs:
-        timeline_events.append({
-            'id': f"audit_{log.log_id}",
-            'type': 'audit_log',
-            'title': log.action.replace('_', ' ').title(),
-            'description': log.target,
-            'timestamp': log.timestamp.isoformat(),
-            'device': log.target if 'Device' in log.target else None,
-            'metadata': {
-                'user': log.actor_user.username if log.actor_user else 'System',
-                'success': log.success,
-                'ip_address': log.ip_address,
-            }
-        })
-    
-    # Add security incidents to timeline
-    incidents = SecurityIncident.objects.select_related('device').filter(
-        created_at__gte=cutoff_date
-    ).order_by('-created_at')[:limit//3]
-    
-    for incident in incidents:
-        timeline_events.append({
-            'id': f"incident_{incident.incident_id}",
-            'type': 'incident',
-            'title': incident.title,
-            'description': incident.description,
-            'timestamp': incident.created_at.isoformat(),
-            'device': incident.device.name if incident.device else None,
-            'metadata': {
-                'severity': incident.severity,
-                'status': incident.status,
-            }
-        })
-    
-    # Sort all events by timestamp (most recent first)
-    timeline_events.sort(key=lambda x: x['timestamp'], reverse=True)
-    
-    # Limit to requested number
-    timeline_events = timeline_events[:limit]
-    
-    return JsonResponse({
+    return OrjsonResponse({
         'timeline': timeline_events,
         'total_events': len(timeline_events),
     })
@@ -1181,17 +1329,17 @@ def api_forensics_evidence_detail(request, evidence_id):
     """
     API endpoint for detailed evidence information
     """
-    from forensics.models import Screenshot
-    import json
-    
     try:
-        screenshot = Screenshot.objects.select_related('device').get(screenshot_id=evidence_id)
+        screenshot = Screenshot.objects.select_related('device').only(
+            'screenshot_id', 'device__device_id', 'device__name', 'taken_at',
+            'file_hash', 'file_size', 'metadata', 'image_file'
+        ).get(screenshot_id=evidence_id)
         
         evidence_data = {
-            'id': str(screenshot.screenshot_id),
-            'device_id': str(screenshot.device.device_id) if screenshot.device else None,
+            'id': screenshot.screenshot_id,
+            'device_id': screenshot.device.device_id if screenshot.device else None,
             'device_name': screenshot.device.name if screenshot.device else 'Unknown Device',
-            'taken_at': screenshot.taken_at.isoformat(),
+            'taken_at': screenshot.taken_at,
             'file_hash': screenshot.file_hash,
             'file_size': screenshot.file_size,
             'trigger_event': screenshot.metadata.get('trigger_event', 'Unknown') if screenshot.metadata else 'Unknown',
@@ -1200,7 +1348,7 @@ def api_forensics_evidence_detail(request, evidence_id):
             'download_url': f"/api/forensics/evidence/{evidence_id}/download/",
         }
         
-        return JsonResponse(evidence_data)
+        return OrjsonResponse(evidence_data)
         
     except Screenshot.DoesNotExist:
         return JsonResponse({
@@ -1218,9 +1366,6 @@ def api_events_list(request):
     """
     API endpoint for events list with filtering
     """
-    from django.utils import timezone
-    from datetime import timedelta
-    
     # Get filter parameters
     event_type = request.GET.get('event_type', '')
     severity = request.GET.get('severity', '')
@@ -1228,11 +1373,11 @@ def api_events_list(request):
     days = int(request.GET.get('days', 7))
     
     # Base queryset
-    events = Event.objects.all()
+    events = Event.objects.select_related('device', 'user')
     
     # Apply filters
     if days > 0:
-        start_date = timezone.now() - timedelta(days=days)
+        start_date = _days_ago(days)
         events = events.filter(timestamp__gte=start_date)
     
     if event_type:
@@ -1246,15 +1391,15 @@ def api_events_list(request):
     
     # Get events data
     events_data = []
-    for event in events.order_by('-timestamp')[:50]:
+    for event in events.order_by('-timestamp')[:50].iterator(chunk_size=200):
         events_data.append({
-            'id': str(event.event_id),
-            'timestamp': event.timestamp.isoformat(),
+            'id': event.event_id,
+            'timestamp': event.timestamp,
             'event_type': event.event_type,
             'event_type_display': event.get_event_type_display(),
             'severity': event.severity,
             'severity_display': event.get_severity_display(),
-            'device_name': event.device.device_name if event.device else None,
+            'device_name': event.device.name if event.device else None,
             'device_id': event.device.id if event.device else None,
             'user': event.user.username if event.user else None,
             'message': event.message,
@@ -1262,9 +1407,9 @@ def api_events_list(request):
             'ip_address': event.ip_address,
         })
     
-    return JsonResponse({
+    return OrjsonResponse({
         'events': events_data,
-        'total': events.count()
+        'total': len(events_data)
     })
 
 
@@ -1273,23 +1418,21 @@ def api_events_stats(request):
     """
     API endpoint for events statistics
     """
-    from django.db.models import Count
-    from django.utils import timezone
-    from datetime import timedelta
-    
     # Get date range
     days = int(request.GET.get('days', 7))
     if days > 0:
-        start_date = timezone.now() - timedelta(days=days)
+        start_date = _days_ago(days)
         events = Event.objects.filter(timestamp__gte=start_date)
     else:
         events = Event.objects.all()
     
     # Basic stats
-    total_events = events.count()
-    today_events = events.filter(timestamp__date=timezone.now().date()).count()
-    critical_events = events.filter(severity='critical').count()
-    warning_events = events.filter(severity='warning').count()
+    event_counts = events.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=_day_filter('timestamp', timezone.localdate())),
+        critical=Count('id', filter=Q(severity='critical')),
+        warning=Count('id', filter=Q(severity='warning')),
+    )
     
     # Event type distribution
     event_types = events.values('event_type').annotate(
@@ -1303,14 +1446,14 @@ def api_events_stats(request):
     
     # Device distribution  
     device_stats = events.filter(device__isnull=False).values(
-        'device__device_name'
+        'device__name'
     ).annotate(count=Count('device')).order_by('-count')[:10]
     
-    return JsonResponse({
-        'total_events': total_events,
-        'today_events': today_events,
-        'critical_events': critical_events,
-        'warning_events': warning_events,
+    return OrjsonResponse({
+        'total_events': event_counts['total'],
+        'today_events': event_counts['today'],
+        'critical_events': event_counts['critical'],
+        'warning_events': event_counts['warning'],
         'event_types': list(event_types),
         'severity_stats': list(severity_stats),
         'device_stats': list(device_stats),
@@ -1322,27 +1465,29 @@ def api_events_chart_data(request):
     """
     API endpoint for events chart data
     """
-    from django.db.models import Count
-    from django.utils import timezone
-    from datetime import timedelta, datetime
-    
     days = int(request.GET.get('days', 7))
     
     # Create date range for chart
-    end_date = timezone.now().date()
+    end_date = timezone.localdate()
     start_date = end_date - timedelta(days=days-1)
     
+    daily_counts = dict(
+        Event.objects.filter(
+            timestamp__gte=_start_of_day(start_date)
+        ).annotate(
+            day=TruncDate('timestamp')
+        ).order_by().values('day').annotate(
+            count=Count('id')
+        ).values_list('day', 'count')
+    )
+    
     chart_data = []
     current_date = start_date
     
     while current_date <= end_date:
-        events_count = Event.objects.filter(
-            timestamp__date=current_date
-        ).count()
-        
         chart_data.append({
             'date': current_date.strftime('%Y-%m-%d'),
-            'events': events_count,
+            'events': daily_counts.get(current_date, 0),
         })
         current_date += timedelta(days=1)
     
@@ -1353,12 +1498,12 @@ def api_events_chart_data(request):
     
     # Event type breakdown for the time period
     event_type_data = Event.objects.filter(
-        timestamp__date__gte=start_date
+        timestamp__gte=_start_of_day(start_date)
     ).values('event_type').annotate(
         count=Count('event_type')
     ).order_by('-count')[:10]
     
-    return JsonResponse({
+    return OrjsonResponse({
         'timeline': chart_data,
         'severity_breakdown': list(severity_data),
         'event_types': list(event_type_data),
@@ -1374,8 +1519,8 @@ def api_event_detail(request, event_id):
         event = Event.objects.get(event_id=event_id)
         
         event_data = {
-            'id': str(event.event_id),
-            'timestamp': event.timestamp.isoformat(),
+            'id': event.event_id,
+            'timestamp': event.timestamp,
             'event_type': event.event_type,
             'event_type_display': event.get_event_type_display(),
             'severity': event.severity,
@@ -1390,7 +1535,7 @@ def api_event_detail(request, event_id):
             'user_agent': event.user_agent,
         }
         
-        return JsonResponse(event_data)
+        return OrjsonResponse(event_data)
         
     except Event.DoesNotExist:
         return JsonResponse({
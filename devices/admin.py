@@ -1,10 +1,12 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import Device, DeviceGroup, DeviceToken, DeviceAction
 
 
 @admin.register(Device)
 class DeviceAdmin(admin.ModelAdmin):
     list_display = ['name', 'hostname', 'status', 'last_seen', 'owner_user', 'registered_at']
+    list_select_related = ['owner_user']
     list_filter = ['status', 'registered_at', 'last_seen']
     search_fields = ['name', 'hostname', 'mac_address', 'ip_address']
     readonly_fields = ['device_id', 'registered_at']
@@ -29,18 +31,24 @@ class DeviceAdmin(admin.ModelAdmin):
 @admin.register(DeviceGroup)
 class DeviceGroupAdmin(admin.ModelAdmin):
     list_display = ['name', 'device_count', 'created_at', 'created_by']
+    list_select_related = ['created_by']
     search_fields = ['name', 'description']
     readonly_fields = ['created_at']
     filter_horizontal = ['devices']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_device_count=Count('devices'))
+    
     def device_count(self, obj):
-        return obj.devices.count()
+        return obj._device_count
     device_count.short_description = 'Device Count'
+    device_count.admin_order_field = '_device_count'
 
 
 @admin.register(DeviceToken)
 class DeviceTokenAdmin(admin.ModelAdmin):
     list_display = ['device', 'token_preview', 'is_active', 'created_at', 'last_used']
+    list_select_related = ['device']
     list_filter = ['is_active', 'created_at']
     search_fields = ['device__name', 'device__hostname']
     readonly_fields = ['token', 'created_at']
@@ -53,6 +61,7 @@ class DeviceTokenAdmin(admin.ModelAdmin):
 @admin.register(DeviceAction)
 class DeviceActionAdmin(admin.ModelAdmin):
     list_display = ['device', 'action_type', 'status', 'initiated_by', 'created_at', 'completed_at']
+    list_select_related = ['device', 'initiated_by']
     list_filter = ['action_type', 'status', 'created_at']
     search_fields = ['device__name', 'device__hostname', 'initiated_by__username']
     readonly_fields = ['created_at', 'updated_at', 'completed_at']
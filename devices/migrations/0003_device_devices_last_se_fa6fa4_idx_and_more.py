@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0002_deviceaction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['-last_seen'], name='devices_last_se_fa6fa4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['is_locked', 'last_seen'], name='devices_is_lock_78e512_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deviceaction',
+            index=models.Index(fields=['-created_at', 'status'], name='device_acti_created_d3eea0_idx'),
+        ),
+    ]
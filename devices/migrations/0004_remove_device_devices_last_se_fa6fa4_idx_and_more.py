@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0003_device_devices_last_se_fa6fa4_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='device',
+            name='devices_last_se_fa6fa4_idx',
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['-last_seen', 'name'], name='devices_last_se_f3daa8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['status', 'last_seen'], name='devices_status_8284e6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['owner_user', 'last_seen'], name='devices_owner_u_a624ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deviceaction',
+            index=models.Index(fields=['device', '-created_at'], name='device_acti_device__7b7008_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deviceaction',
+            index=models.Index(fields=['status', 'created_at'], name='device_acti_status_0cffee_idx'),
+        ),
+    ]
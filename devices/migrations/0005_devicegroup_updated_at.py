@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0004_remove_device_devices_last_se_fa6fa4_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicegroup',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
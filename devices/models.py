@@ -1,10 +1,63 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from datetime import timedelta
+from events.models import Event
 import uuid
 
 User = get_user_model()
 
+# A device is online if it sent a heartbeat within this window
+ONLINE_WINDOW = timedelta(minutes=5)
+
+# Minimum seconds between last_seen writes for a device whose state is unchanged
+HEARTBEAT_WRITE_INTERVAL = 60
+
+# Seconds a device_id -> pk mapping is cached for the heartbeat path
+DEVICE_PK_CACHE_TIMEOUT = 300
+
+# Seconds the fleet-wide status counts are shared between the API and dashboard pollers
+DEVICE_STATS_TIMEOUT = 5
+
+
+class DeviceQuerySet(models.QuerySet):
+    def online(self):
+        """Devices that sent a heartbeat within ONLINE_WINDOW"""
+        return self.filter(last_seen__gte=timezone.now() - ONLINE_WINDOW)
+    
+    def offline(self):
+        """Devices not heard from within ONLINE_WINDOW, including ones never seen"""
+        cutoff = timezone.now() - ONLINE_WINDOW
+        return self.filter(models.Q(last_seen__lt=cutoff) | models.Q(last_seen__isnull=True))
+    
+    def status_counts(self):
+        """Total, online and locked device counts in a single aggregate query"""
+        online_cutoff = timezone.now() - ONLINE_WINDOW
+        return self.aggregate(
+            total=models.Count('id'),
+            online=models.Count('id', filter=models.Q(last_seen__gte=online_cutoff)),
+            locked=models.Count('id', filter=models.Q(is_locked=True)),
+        )
+    
+    def cached_status_counts(self):
+        """status_counts() for the whole fleet, recomputed at most every DEVICE_STATS_TIMEOUT seconds"""
+        return cache.get_or_set('devices:status_counts', self.all().status_counts, DEVICE_STATS_TIMEOUT)
+    
+    def with_online_flag(self):
+        """Annotate is_online_db so is_online is computed in SQL instead of per instance"""
+        cutoff = timezone.now() - ONLINE_WINDOW
+        return self.annotate(
+            is_online_db=models.Case(
+                models.When(last_seen__gte=cutoff, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
 
 class Device(models.Model):
     """
@@ -108,11 +161,19 @@ class Device(models.Model):
         help_text=_('Whether device is active')
     )
     
+    objects = DeviceQuerySet.as_manager()
+    
     class Meta:
         db_table = 'devices'
         verbose_name = _('Device')
         verbose_name_plural = _('Devices')
         ordering = ['-last_seen', 'name']
+        indexes = [
+            models.Index(fields=['-last_seen', 'name']),
+            models.Index(fields=['is_locked', 'last_seen']),
+            models.Index(fields=['status', 'last_seen']),
+            models.Index(fields=['owner_user', 'last_seen']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.hostname}) - {self.get_status_display()}"
@@ -120,11 +181,11 @@ class Device(models.Model):
     @property
     def is_online(self):
         """Check if device is considered online based on last_seen"""
+        if 'is_online_db' in self.__dict__:
+            return self.is_online_db
         if not self.last_seen:
             return False
-        from django.utils import timezone
-        from datetime import timedelta
-        return timezone.now() - self.last_seen < timedelta(minutes=5)
+        return timezone.now() - self.last_seen < ONLINE_WINDOW
     
     @property
     def uptime_percentage(self):
@@ -132,133 +193,261 @@ class Device(models.Model):
         # This would need to be implemented based on heartbeat logs
         return 95.0  # Placeholder
     
-    def update_heartbeat(self, agent_data=None):
-        """Update device heartbeat with optional agent data"""
-        from django.utils import timezone
-        self.last_seen = timezone.now()
-        self.status = 'online'
+    @staticmethod
+    def _pk_cache_key(device_id):
+        return f'devices:pk:{device_id}'
+    
+    @staticmethod
+    def detail_cache_key(pk):
+        """Cache key for the serialized device detail response"""
+        return f'devices:detail:{pk}'
+    
+    @classmethod
+    def forget_cached_details(cls, pks):
+        """Drop cached detail responses for devices whose row was just written"""
+        cache.delete_many([cls.detail_cache_key(pk) for pk in pks])
+    
+    @classmethod
+    def pk_for_device_id(cls, device_id):
+        """
+        Primary key for an agent's device_id, cached so heartbeats skip the UUID lookup.
         
-        if agent_data:
-            if 'agent_version' in agent_data:
-                self.agent_version = agent_data['agent_version']
-            if 'hardware_info' in agent_data:
-                self.hardware_info.update(agent_data['hardware_info'])
-            if 'ip_address' in agent_data:
-                self.ip_address = agent_data['ip_address']
+        Raises Device.DoesNotExist for unknown ids; misses are not cached.
+        """
+        key = cls._pk_cache_key(device_id)
+        pk = cache.get(key)
+        if pk is None:
+            pk = cls.objects.values_list('pk', flat=True).get(device_id=device_id)
+            cache.set(key, pk, DEVICE_PK_CACHE_TIMEOUT)
+        return pk
+    
+    @classmethod
+    def record_heartbeats(cls, states):
+        """
+        Stamp a batch of heartbeats given as {pk: (status, is_locked, seen_at)}.
+        
+        Buffered heartbeats can be older than what is already stored, so:
+        last_seen only moves forward, and status/is_locked are applied only
+        when the heartbeat is newer than last_seen and than the last lock or
+        unlock command (a beat received before a lock must not undo it).
+        Rows whose stored last_seen is within HEARTBEAT_WRITE_INTERVAL of the
+        heartbeat and whose state would not change are left alone, so steady
+        agents rewrite the device row (and its last_seen indexes) at most once
+        per interval. The interval is well inside the 5 minute is_online window.
+        
+        On PostgreSQL this is one UPDATE ... FROM (VALUES ...) per 1000 devices;
+        other backends read the affected rows once and bulk_update the changes.
+        """
+        if connection.vendor != 'postgresql':
+            cls._record_heartbeats_portable(states)
+            return
         
-        self.save(update_fields=['last_seen', 'status', 'agent_version', 'hardware_info', 'ip_address'])
+        items = list(states.items())
+        table = connection.ops.quote_name(cls._meta.db_table)
+        fresh = (
+            "((d.last_seen IS NULL OR v.t > d.last_seen) "
+            "AND (d.last_lock_time IS NULL OR v.t > d.last_lock_time) "
+            "AND (d.last_unlock_time IS NULL OR v.t > d.last_unlock_time))"
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(items), 1000):
+                chunk = items[start:start + 1000]
+                values = ', '.join(['(%s::bigint, %s::varchar, %s::boolean, %s::timestamptz)'] * len(chunk))
+                params = [value for pk, state in chunk for value in (pk, *state)]
+                cursor.execute(
+                    f"UPDATE {table} AS d SET "
+                    f"status = CASE WHEN {fresh} THEN v.s ELSE d.status END, "
+                    f"is_locked = CASE WHEN {fresh} THEN v.l ELSE d.is_locked END, "
+                    "last_seen = GREATEST(d.last_seen, v.t) "
+                    f"FROM (VALUES {values}) AS v(pk, s, l, t) "
+                    "WHERE d.id = v.pk AND (d.last_seen IS NULL "
+                    "OR d.last_seen < v.t - %s * interval '1 second' "
+                    f"OR ({fresh} AND (d.status <> v.s OR d.is_locked <> v.l))) "
+                    "RETURNING d.id",
+                    params + [HEARTBEAT_WRITE_INTERVAL]
+                )
+                cls.forget_cached_details(pk for (pk,) in cursor.fetchall())
+    
+    @classmethod
+    def _record_heartbeats_portable(cls, states):
+        """record_heartbeats() with the same rules, for backends without UPDATE ... FROM"""
+        interval = timedelta(seconds=HEARTBEAT_WRITE_INTERVAL)
+        changed = []
+        current = cls.objects.filter(pk__in=states).values_list(
+            'pk', 'last_seen', 'last_lock_time', 'last_unlock_time', 'status', 'is_locked'
+        )
+        for pk, last_seen, lock_time, unlock_time, old_status, old_locked in current:
+            status, is_locked, seen_at = states[pk]
+            if not all(t is None or seen_at > t for t in (last_seen, lock_time, unlock_time)):
+                status, is_locked = old_status, old_locked
+            stale = last_seen is None or last_seen < seen_at - interval
+            if stale or (status, is_locked) != (old_status, old_locked):
+                changed.append(cls(
+                    pk=pk, status=status, is_locked=is_locked,
+                    last_seen=seen_at if last_seen is None else max(last_seen, seen_at)
+                ))
+        cls.objects.bulk_update(changed, ['status', 'is_locked', 'last_seen'], batch_size=1000)
+        cls.forget_cached_details(device.pk for device in changed)
     
-    def lock_screen(self, reason="Manual lock", admin_user=None):
+    @transaction.atomic
+    def lock_screen(self, reason="Manual lock", admin_user=None, metadata=None):
         """Lock the device screen"""
-        from django.utils import timezone
         self.is_locked = True
         self.last_lock_time = timezone.now()
         self.status = 'locked'
         self.save(update_fields=['is_locked', 'last_lock_time', 'status'])
         
         # Create device action record
-        DeviceAction.objects.create(
+        action = DeviceAction.objects.create(
             device=self,
             action_type='lock',
             initiated_by=admin_user,
             reason=reason,
-            status='pending'
+            status='pending',
+            metadata=metadata or {}
         )
         
         # Log the action
-        from events.models import Event
         Event.objects.create(
             device=self,
             user=admin_user,
-            event_type='lock',
-            details=f"Screen locked: {reason}",
+            event_type='action_lock_sent',
+            message=f"Screen locked: {reason}",
             severity='info'
         )
         
-        return True
+        return action
     
-    def unlock_screen(self, admin_user=None):
+    @transaction.atomic
+    def unlock_screen(self, reason="", admin_user=None, metadata=None):
         """Unlock the device screen"""
-        from django.utils import timezone
         self.is_locked = False
         self.last_unlock_time = timezone.now()
         self.status = 'online' if self.is_online else 'offline'
         self.save(update_fields=['is_locked', 'last_unlock_time', 'status'])
         
         # Create device action record
-        DeviceAction.objects.create(
+        action = DeviceAction.objects.create(
             device=self,
             action_type='unlock',
             initiated_by=admin_user,
-            status='pending'
+            reason=reason,
+            status='pending',
+            metadata=metadata or {}
         )
         
         # Log the action
-        from events.models import Event
         Event.objects.create(
             device=self,
             user=admin_user,
-            event_type='unlock',
-            details="Screen unlocked by administrator",
+            event_type='action_unlock_sent',
+            message="Screen unlocked by administrator",
             severity='info'
         )
         
-        return True
+        return action
+    
+    @classmethod
+    def bulk_lock(cls, devices, reason="Manual lock", admin_user=None):
+        """Lock several devices with one UPDATE and one INSERT per table"""
+        now = timezone.now()
+        for device in devices:
+            device.is_locked = True
+            device.last_lock_time = now
+            device.status = 'locked'
+        return cls._bulk_record_action(
+            devices, ['is_locked', 'last_lock_time', 'status'],
+            'lock', 'action_lock_sent', f"Screen locked: {reason}", reason, admin_user
+        )
     
-    def restart_device(self, admin_user=None):
+    @classmethod
+    def bulk_unlock(cls, devices, reason="", admin_user=None):
+        """Unlock several devices with one UPDATE and one INSERT per table"""
+        now = timezone.now()
+        for device in devices:
+            device.is_locked = False
+            device.last_unlock_time = now
+            device.status = 'online' if device.is_online else 'offline'
+        return cls._bulk_record_action(
+            devices, ['is_locked', 'last_unlock_time', 'status'],
+            'unlock', 'action_unlock_sent', "Screen unlocked by administrator", reason, admin_user
+        )
+    
+    @classmethod
+    def _bulk_record_action(cls, devices, fields, action_type, event_type, message, reason, admin_user):
+        with transaction.atomic():
+            cls.objects.bulk_update(devices, fields, batch_size=1000)
+            cls.forget_cached_details(device.pk for device in devices)
+            actions = DeviceAction.objects.bulk_create([
+                DeviceAction(
+                    device=device,
+                    action_type=action_type,
+                    initiated_by=admin_user,
+                    reason=reason,
+                    status='pending'
+                )
+                for device in devices
+            ], batch_size=1000)
+            Event.objects.bulk_create([
+                Event(
+                    device=device,
+                    user=admin_user,
+                    event_type=event_type,
+                    message=message,
+                    severity='info',
+                    source='api'
+                )
+                for device in devices
+            ], batch_size=1000)
+        return actions
+    
+    @transaction.atomic
+    def restart_device(self, reason="", admin_user=None, metadata=None):
         """Request device restart"""
         # Create device action record
-        DeviceAction.objects.create(
+        action = DeviceAction.objects.create(
             device=self,
             action_type='restart',
             initiated_by=admin_user,
-            status='pending'
+            reason=reason,
+            status='pending',
+            metadata=metadata or {}
         )
         
         # Log the action
-        from events.models import Event
         Event.objects.create(
             device=self,
             user=admin_user,
-            event_type='restart_requested',
-            details="Device restart requested by administrator",
+            event_type='action_restart_sent',
+            message="Device restart requested by administrator",
             severity='warning'
         )
         
-        return True
+        return action
     
-    def take_screenshot(self, admin_user=None):
-        """Request screenshot from device"""
-        from forensics.models import Screenshot
-        from django.utils import timezone
-        
-        screenshot = Screenshot.objects.create(
-            device=self,
-            taken_by=admin_user,
-            filename=f"screenshot_{self.hostname}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.png",
-            status='requested'
-        )
-        
+    @transaction.atomic
+    def take_screenshot(self, reason="", admin_user=None, metadata=None):
+        """Request screenshot from device (the agent uploads the Screenshot itself)"""
         # Create device action record
-        DeviceAction.objects.create(
+        action = DeviceAction.objects.create(
             device=self,
             action_type='screenshot',
             initiated_by=admin_user,
+            reason=reason,
             status='pending',
-            metadata={'screenshot_id': screenshot.id}
+            metadata=metadata or {}
         )
         
         # Log the action
-        from events.models import Event
         Event.objects.create(
             device=self,
             user=admin_user,
-            event_type='screenshot_requested',
-            details=f"Screenshot requested - ID: {screenshot.id}",
+            event_type='action_screenshot_sent',
+            message=f"Screenshot requested - action {action.id}",
             severity='info'
         )
         
-        return screenshot
+        return action
 
 
 class DeviceGroup(models.Model):
@@ -281,6 +470,7 @@ class DeviceGroup(models.Model):
         help_text=_('Devices in this group')
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -378,22 +568,38 @@ class DeviceAction(models.Model):
         verbose_name = _('Device Action')
         verbose_name_plural = _('Device Actions')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'status']),
+            models.Index(fields=['device', '-created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
     
     def __str__(self):
         return f"{self.get_action_type_display()} on {self.device.name} - {self.get_status_display()}"
     
     def mark_completed(self):
         """Mark action as completed"""
-        from django.utils import timezone
         self.status = 'completed'
         self.completed_at = timezone.now()
-        self.save(update_fields=['status', 'completed_at'])
+        self.save(update_fields=['status', 'completed_at', 'updated_at'])
     
     def mark_failed(self, error_message=None):
         """Mark action as failed"""
-        from django.utils import timezone
         self.status = 'failed'
         self.completed_at = timezone.now()
         if error_message:
             self.metadata['error'] = error_message
-        self.save(update_fields=['status', 'completed_at', 'metadata'])
+        self.save(update_fields=['status', 'completed_at', 'metadata', 'updated_at'])
+
+
+@receiver(post_delete, sender=Device)
+def forget_device_pk(sender, instance, **kwargs):
+    """Drop the cached device_id -> pk mapping so heartbeats for a deleted device 404"""
+    cache.delete(Device._pk_cache_key(instance.device_id))
+    Device.forget_cached_details([instance.pk])
+
+
+@receiver(post_save, sender=Device)
+def forget_device_detail(sender, instance, **kwargs):
+    """Drop the cached detail response whenever a device is saved"""
+    Device.forget_cached_details([instance.pk])
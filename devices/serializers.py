@@ -27,6 +27,22 @@ class DeviceSerializer(serializers.ModelSerializer):
         ]
 
 
+class DeviceListSerializer(serializers.ModelSerializer):
+    """
+    Slim device serializer for list responses (no hardware_info or nested owner)
+    """
+    owner_username = serializers.CharField(source='owner_user.username', read_only=True, default=None)
+    is_online = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = Device
+        fields = [
+            'id', 'device_id', 'name', 'hostname', 'owner_user_id', 'owner_username',
+            'ip_address', 'status', 'is_locked', 'last_seen', 'is_online'
+        ]
+        read_only_fields = fields
+
+
 class DeviceCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for device registration
@@ -77,17 +93,20 @@ class DeviceGroupSerializer(serializers.ModelSerializer):
     Device group serializer
     """
     device_count = serializers.SerializerMethodField()
-    devices = DeviceSerializer(many=True, read_only=True)
+    devices = DeviceListSerializer(many=True, read_only=True)
     
     class Meta:
         model = DeviceGroup
         fields = [
             'id', 'name', 'description', 'devices', 'device_count',
-            'created_at', 'created_by'
+            'created_at', 'updated_at', 'created_by'
         ]
-        read_only_fields = ['created_at', 'created_by']
+        read_only_fields = ['created_at', 'updated_at', 'created_by']
     
     def get_device_count(self, obj):
+        # Annotated by the group views; fall back to a COUNT for bare instances
+        if hasattr(obj, 'device_count'):
+            return obj.device_count
         return obj.devices.count()
 
 
@@ -95,7 +114,7 @@ class DeviceTokenSerializer(serializers.ModelSerializer):
     """
     Device token serializer
     """
-    device = DeviceSerializer(read_only=True)
+    device = DeviceListSerializer(read_only=True)
     
     class Meta:
         model = DeviceToken
@@ -107,9 +126,18 @@ class DeviceActionSerializer(serializers.Serializer):
     """
     Serializer for device actions (lock/unlock/screenshot)
     """
-    action = serializers.ChoiceField(choices=['lock', 'unlock', 'screenshot', 'restart_agent'])
-    message = serializers.CharField(required=False)
-    force = serializers.BooleanField(default=False)
+    action = serializers.ChoiceField(choices=['lock', 'unlock', 'screenshot'])
+    reason = serializers.CharField(required=False, allow_blank=True)
+    message = serializers.CharField(required=False, help_text='Text for the agent to show on the device')
+
+
+class DeviceBulkActionSerializer(serializers.Serializer):
+    """
+    Serializer for locking or unlocking several devices at once
+    """
+    action = serializers.ChoiceField(choices=['lock', 'unlock'])
+    device_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=1000)
+    reason = serializers.CharField(required=False, allow_blank=True)
 
 
 class DeviceActionModelSerializer(serializers.ModelSerializer):
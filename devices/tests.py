@@ -1,3 +1,165 @@
+import uuid
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from events.models import Event
+from .models import Device, DeviceAction
+
+
+class RecordHeartbeatsTests(TestCase):
+    """
+    Device.record_heartbeats must never move a device back to older state
+    """
+    def setUp(self):
+        self.device = Device.objects.create(name='pc-1', hostname='pc-1-host')
+    
+    def test_heartbeat_received_before_lock_does_not_unlock(self):
+        received = timezone.now()
+        self.device.lock_screen(reason='test')
+        
+        Device.record_heartbeats({self.device.pk: ('online', False, received)})
+        
+        self.device.refresh_from_db()
+        self.assertEqual((self.device.status, self.device.is_locked), ('locked', True))
+    
+    def test_heartbeat_after_unlock_is_applied(self):
+        self.device.lock_screen(reason='test')
+        self.device.unlock_screen(reason='test')
+        seen = timezone.now()
+        
+        Device.record_heartbeats({self.device.pk: ('online', False, seen)})
+        
+        self.device.refresh_from_db()
+        self.assertEqual((self.device.status, self.device.is_locked, self.device.last_seen), ('online', False, seen))
+    
+    def test_last_seen_never_moves_backwards(self):
+        seen = timezone.now()
+        Device.record_heartbeats({self.device.pk: ('online', False, seen)})
+        Device.record_heartbeats({self.device.pk: ('locked', True, seen - timedelta(minutes=10))})
+        
+        self.device.refresh_from_db()
+        self.assertEqual((self.device.status, self.device.is_locked, self.device.last_seen), ('online', False, seen))
+
+
+class DeviceBulkActionTests(TestCase):
+    """
+    POST /api/devices/bulk-action/
+    """
+    url = '/api/devices/bulk-action/'
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create(username='admin', role='superadmin')
+        self.client.force_authenticate(self.admin)
+        self.devices = [Device.objects.create(name=f'pc-{i}', hostname=f'pc-{i}-host') for i in range(3)]
+    
+    def post(self, action, device_ids, **extra):
+        return self.client.post(self.url, {
+            'action': action,
+            'device_ids': [str(device_id) for device_id in device_ids],
+            **extra,
+        }, format='json')
+    
+    def test_lock_records_one_action_and_event_per_device(self):
+        response = self.post('lock', [device.device_id for device in self.devices], reason='drill')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['action_ids']), 3)
+        self.assertEqual(response.data['not_found'], [])
+        self.assertEqual(Device.objects.filter(is_locked=True, status='locked').count(), 3)
+        self.assertEqual(DeviceAction.objects.filter(action_type='lock', reason='drill', initiated_by=self.admin).count(), 3)
+        self.assertEqual(Event.objects.filter(event_type='action_lock_sent').count(), 3)
+    
+    def test_unlock(self):
+        Device.bulk_lock(self.devices, admin_user=self.admin)
+        
+        response = self.post('unlock', [self.devices[0].device_id])
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Device.objects.filter(is_locked=False).values_list('pk', flat=True)), [self.devices[0].pk])
+        self.assertEqual(Event.objects.filter(event_type='action_unlock_sent').count(), 1)
+    
+    def test_unknown_ids_are_reported(self):
+        unknown = uuid.uuid4()
+        
+        response = self.post('lock', [self.devices[0].device_id, unknown])
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['not_found'], [str(unknown)])
+        self.assertEqual(Device.objects.filter(is_locked=True).count(), 1)
+    
+    def test_no_matching_devices_is_404(self):
+        unknown = uuid.uuid4()
+        
+        response = self.post('lock', [unknown])
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['not_found'], [str(unknown)])
+    
+    def test_role_without_capability_is_403(self):
+        self.client.force_authenticate(User.objects.create(username='auditor', role='auditor'))
+        
+        response = self.post('lock', [self.devices[0].device_id])
+        
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Device.objects.filter(is_locked=True).exists())
+    
+    def test_more_than_1000_ids_is_400(self):
+        response = self.post('lock', [uuid.uuid4() for _ in range(1001)])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('device_ids', response.data)
+
 
-# Create your tests here.
+class DeviceActionEndpointTests(TestCase):
+    """
+    POST /api/devices/{device_id}/action/
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create(username='admin', role='superadmin')
+        self.client.force_authenticate(self.admin)
+        self.device = Device.objects.create(name='pc-1', hostname='pc-1-host')
+    
+    def post(self, device_id, **data):
+        return self.client.post(f'/api/devices/{device_id}/action/', data, format='json')
+    
+    def test_lock_records_reason_and_agent_message(self):
+        response = self.post(self.device.device_id, action='lock', reason='drill', message='Locked by IT')
+        
+        self.assertEqual(response.status_code, 200)
+        action = DeviceAction.objects.get(pk=response.data['action_id'])
+        self.assertEqual(
+            (action.device_id, action.action_type, action.reason, action.metadata),
+            (self.device.pk, 'lock', 'drill', {'message': 'Locked by IT'})
+        )
+        self.assertTrue(Device.objects.get(pk=self.device.pk).is_locked)
+    
+    def test_screenshot_without_reason_uses_default(self):
+        response = self.post(self.device.device_id, action='screenshot')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DeviceAction.objects.get().reason, 'Manual screenshot via API')
+    
+    def test_restart_agent_is_rejected(self):
+        response = self.post(self.device.device_id, action='restart_agent')
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(DeviceAction.objects.exists())
+    
+    def test_role_without_capability_is_403(self):
+        self.client.force_authenticate(User.objects.create(username='auditor', role='auditor'))
+        
+        response = self.post(self.device.device_id, action='lock')
+        
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(DeviceAction.objects.exists())
+    
+    def test_unknown_device_is_404(self):
+        response = self.post(uuid.uuid4(), action='lock')
+        
+        self.assertEqual(response.status_code, 404)
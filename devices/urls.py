@@ -19,6 +19,7 @@ urlpatterns = [
     path('<uuid:device_id>/unlock/', views.device_unlock, name='device_unlock'),
     path('<uuid:device_id>/screenshot/', views.device_screenshot, name='device_screenshot'),
     path('<uuid:device_id>/restart/', views.device_restart, name='device_restart'),
+    path('bulk-action/', views.device_bulk_action, name='device_bulk_action'),
     path('actions/<int:action_id>/status/', views.device_action_status, name='action_status'),
     
     # Device Groups
@@ -1,33 +1,137 @@
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from django.utils import timezone
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, quote_etag
 from .models import Device, DeviceGroup, DeviceToken, DeviceAction
 from .serializers import (
-    DeviceSerializer, DeviceCreateSerializer, DeviceUpdateSerializer,
+    DeviceSerializer, DeviceListSerializer, DeviceCreateSerializer, DeviceUpdateSerializer,
     DeviceHeartbeatSerializer, DeviceGroupSerializer, DeviceTokenSerializer,
-    DeviceActionSerializer, DeviceActionModelSerializer, DeviceActionCreateSerializer
+    DeviceActionSerializer, DeviceActionModelSerializer, DeviceActionCreateSerializer,
+    DeviceBulkActionSerializer
 )
-from events.models import Event, DeviceHeartbeat
+from authentication.models import (
+    LOCK_DEVICES, MANAGE_DEVICES, RESTART_DEVICES, TAKE_SCREENSHOTS, UNLOCK_DEVICES
+)
+from webadmin.parsers import ORJSONParser
+from events.buffers import device_state_buffer, heartbeat_buffer, log_event
+from events.models import DeviceHeartbeat
+import hashlib
 import uuid
 import secrets
 
+# Columns DeviceListSerializer renders, for only() on list and group member querysets
+DEVICE_LIST_FIELDS = [
+    'id', 'device_id', 'name', 'hostname', 'ip_address', 'status',
+    'is_locked', 'last_seen', 'owner_user__username'
+]
+
+# Seconds a serialized group stays valid (bounds how stale member is_online flags can get)
+GROUP_CACHE_TIMEOUT = 60
+
+# Seconds a serialized device detail stays valid when no write invalidates it first
+DEVICE_DETAIL_TIMEOUT = 10
+
+
+def _group_queryset():
+    """
+    Device groups with member counts and members prefetched in list form (built per request,
+    since with_online_flag() bakes in the current time)
+    """
+    members = Device.objects.with_online_flag().select_related('owner_user').only(*DEVICE_LIST_FIELDS)
+    return DeviceGroup.objects.annotate(device_count=Count('devices')).order_by('name').prefetch_related(
+        Prefetch('devices', queryset=members)
+    )
+
+
+def _group_etag(pk):
+    """
+    ETag for a device group: changes with the group row, its membership and member heartbeats
+    """
+    version = DeviceGroup.objects.filter(pk=pk).annotate(
+        member_count=Count('devices'),
+        member_last_seen=Max('devices__last_seen'),
+    ).values_list('updated_at', 'member_count', 'member_last_seen').first()
+    if version is None:
+        return None
+    bucket = int(timezone.now().timestamp()) // GROUP_CACHE_TIMEOUT
+    return quote_etag(hashlib.md5(f'{pk}:{bucket}:{version}'.encode()).hexdigest())
+
+
+# Per-device actions: Device method, required capability, default reason, success message
+DEVICE_ACTIONS = {
+    'lock': (
+        Device.lock_screen, LOCK_DEVICES,
+        'Manual lock via API', 'Device lock command sent successfully'
+    ),
+    'unlock': (
+        Device.unlock_screen, UNLOCK_DEVICES,
+        'Manual unlock via API', 'Device unlock command sent successfully'
+    ),
+    'screenshot': (
+        Device.take_screenshot, TAKE_SCREENSHOTS,
+        'Manual screenshot via API', 'Screenshot command sent successfully'
+    ),
+    'restart': (
+        Device.restart_device, RESTART_DEVICES,
+        'Manual restart via API', 'Device restart command sent successfully'
+    ),
+}
+
+
+def _dispatch_device_action(request, device_id, action, reason=None, metadata=None):
+    """
+    Shared body of the per-device action endpoints: permission check, device lookup, dispatch
+    """
+    method, capability, default_reason, success_message = DEVICE_ACTIONS[action]
+    
+    # Check permissions before touching the database
+    if not request.user.has_capability(capability):
+        return Response(
+            {'error': 'Insufficient permissions'}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    device = get_object_or_404(Device, device_id=device_id)
+    
+    try:
+        result = method(device, reason=reason or default_reason, admin_user=request.user, metadata=metadata)
+        
+        return Response({
+            'success': True,
+            'message': success_message,
+            'action_id': result.id,
+            'status': result.status
+        })
+    except Exception as e:
+        return Response(
+            {'error': str(e)}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 
 class DeviceListCreateView(generics.ListCreateAPIView):
     """
     List all devices or register a new device
     """
-    queryset = Device.objects.all()
+    queryset = Device.objects.select_related('owner_user')
     permission_classes = [permissions.IsAuthenticated]
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return DeviceCreateSerializer
-        return DeviceSerializer
+        return DeviceListSerializer
     
     def get_queryset(self):
-        queryset = Device.objects.all()
+        # Skip hardware_info and the other columns the list serializer does not render
+        queryset = Device.objects.with_online_flag().select_related('owner_user').only(
+            *DEVICE_LIST_FIELDS
+        )
         
         # Filter by status
         status = self.request.query_params.get('status')
@@ -40,13 +144,9 @@ class DeviceListCreateView(generics.ListCreateAPIView):
             online = online.lower() == 'true'
             if online:
                 # Consider devices online if they sent heartbeat in last 5 minutes
-                from datetime import timedelta
-                cutoff = timezone.now() - timedelta(minutes=5)
-                queryset = queryset.filter(last_seen__gte=cutoff)
+                queryset = queryset.online()
             else:
-                from datetime import timedelta
-                cutoff = timezone.now() - timedelta(minutes=5)
-                queryset = queryset.filter(last_seen__lt=cutoff)
+                queryset = queryset.offline()
         
         return queryset.order_by('-last_seen')
     
@@ -58,54 +158,55 @@ class DeviceListCreateView(generics.ListCreateAPIView):
         DeviceToken.objects.create(device=device, token=token)
         
         # Log device registration
-        Event.objects.create(
+        log_event(
             event_type='device_registered',
             device=device,
             user=self.request.user if self.request.user.is_authenticated else None,
             message=f"Device {device.name} registered",
-            ip_address=self.get_client_ip(),
+            ip_address=self.request.client_ip,
             source='api'
         )
-    
-    def get_client_ip(self):
-        x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = self.request.META.get('REMOTE_ADDR')
-        return ip
 
 
 class DeviceDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a device
     """
-    queryset = Device.objects.all()
     serializer_class = DeviceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        # Built per request: with_online_flag() bakes in the current time
+        return Device.objects.with_online_flag().select_related('owner_user')
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@parser_classes([ORJSONParser])
 def device_heartbeat(request, device_id):
     """
     Receive heartbeat from device agent
     """
-    device = get_object_or_404(Device, device_id=device_id)
+    try:
+        device_pk = Device.pk_for_device_id(device_id)
+    except Device.DoesNotExist:
+        raise Http404
     
     serializer = DeviceHeartbeatSerializer(data=request.data)
     if serializer.is_valid():
         data = serializer.validated_data
         
-        # Update device status
-        device.status = data.get('status', 'online')
-        device.is_locked = data.get('is_locked', False)
-        device.last_seen = timezone.now()
-        device.save()
+        # Queue the device status update; the latest state per device is written in batches
+        device_state_buffer.add((
+            device_pk,
+            data.get('status', 'online'),
+            data.get('is_locked', False),
+            timezone.now()
+        ))
         
-        # Create heartbeat record
-        DeviceHeartbeat.objects.create(
-            device=device,
+        # Queue the heartbeat history row; it is written in batches
+        heartbeat_buffer.add(DeviceHeartbeat(
+            device_id=device_pk,
             status=data.get('status', 'online'),
             is_locked=data.get('is_locked', False),
             cpu_usage=data.get('cpu_usage'),
@@ -113,7 +214,7 @@ def device_heartbeat(request, device_id):
             disk_usage=data.get('disk_usage'),
             agent_version=data.get('agent_version', ''),
             metadata=data.get('metadata', {})
-        )
+        ))
         
         return Response({'status': 'ok'}, status=status.HTTP_200_OK)
     
@@ -126,47 +227,25 @@ def device_action(request, device_id):
     """
     Send action to device (lock, unlock, screenshot, etc.)
     """
-    device = get_object_or_404(Device, device_id=device_id)
-    
     serializer = DeviceActionSerializer(data=request.data)
-    if serializer.is_valid():
-        action = serializer.validated_data['action']
-        message = serializer.validated_data.get('message', '')
-        force = serializer.validated_data.get('force', False)
-        
-        # Log the action
-        Event.objects.create(
-            event_type=f'device_{action}',
-            device=device,
-            user=request.user,
-            message=f"Admin {request.user.username} triggered {action} on {device.name}",
-            metadata={
-                'action': action,
-                'message': message,
-                'force': force
-            },
-            ip_address=request.META.get('REMOTE_ADDR'),
-            source='dashboard'
-        )
-        
-        # In a real implementation, this would send the command to the agent
-        # For now, we'll just return success
-        return Response({
-            'status': 'success',
-            'message': f'Action {action} sent to device {device.name}'
-        }, status=status.HTTP_200_OK)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    metadata = {'message': data['message']} if data.get('message') else None
+    return _dispatch_device_action(request, device_id, data['action'], data.get('reason'), metadata)
 
 
 class DeviceGroupListCreateView(generics.ListCreateAPIView):
     """
     List all device groups or create a new group
     """
-    queryset = DeviceGroup.objects.all()
     serializer_class = DeviceGroupSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_queryset(self):
+        return _group_queryset()
+    
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
@@ -175,9 +254,28 @@ class DeviceGroupDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a device group
     """
-    queryset = DeviceGroup.objects.all()
     serializer_class = DeviceGroupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return _group_queryset()
+    
+    def retrieve(self, request, *args, **kwargs):
+        # Answer conditional GETs with 304 and reuse the serialized group while nothing changed
+        etag = _group_etag(kwargs['pk'])
+        if etag is None:
+            return super().retrieve(request, *args, **kwargs)
+        
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        data = cache.get_or_set(
+            f'devices:group:{etag}',
+            lambda: self.get_serializer(self.get_object()).data,
+            GROUP_CACHE_TIMEOUT
+        )
+        return Response(data, headers={'ETag': etag})
 
 
 class DeviceTokenListView(generics.ListAPIView):
@@ -189,10 +287,13 @@ class DeviceTokenListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        # Only superadmin and it_admin can view tokens
+        # Only users who manage devices (superadmin, it_admin) can view tokens
         user = self.request.user
-        if user.role in ['superadmin', 'it_admin']:
-            return DeviceToken.objects.all().order_by('-created_at')
+        if user.has_capability(MANAGE_DEVICES):
+            return DeviceToken.objects.select_related('device__owner_user').only(
+                'id', 'token', 'created_at', 'last_used', 'is_active',
+                *(f'device__{field}' for field in DEVICE_LIST_FIELDS)
+            ).order_by('-created_at')
         return DeviceToken.objects.none()
 
 
@@ -202,12 +303,10 @@ def device_stats(request):
     """
     Get device statistics
     """
-    from datetime import timedelta
-    
-    total_devices = Device.objects.count()
-    online_cutoff = timezone.now() - timedelta(minutes=5)
-    online_devices = Device.objects.filter(last_seen__gte=online_cutoff).count()
-    locked_devices = Device.objects.filter(is_locked=True).count()
+    counts = Device.objects.cached_status_counts()
+    total_devices = counts['total']
+    online_devices = counts['online']
+    locked_devices = counts['locked']
     offline_devices = total_devices - online_devices
     
     return Response({
@@ -219,11 +318,20 @@ def device_stats(request):
     })
 
 
+class DeviceActionCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the device action history (avoids deep OFFSET scans)
+    """
+    page_size = 50
+    ordering = ('-created_at', '-id')
+
+
 class DeviceActionListCreateView(generics.ListCreateAPIView):
     """
     List device actions or create new action
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DeviceActionCursorPagination
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -231,7 +339,9 @@ class DeviceActionListCreateView(generics.ListCreateAPIView):
         return DeviceActionModelSerializer
     
     def get_queryset(self):
-        queryset = DeviceAction.objects.all().order_by('-created_at')
+        queryset = DeviceAction.objects.select_related(
+            'device__owner_user', 'initiated_by'
+        ).order_by('-created_at')
         
         # Filter by device
         device_id = self.request.query_params.get('device')
@@ -255,7 +365,7 @@ class DeviceActionDetailView(generics.RetrieveUpdateAPIView):
     """
     Retrieve or update specific device action
     """
-    queryset = DeviceAction.objects.all()
+    queryset = DeviceAction.objects.select_related('device__owner_user', 'initiated_by')
     serializer_class = DeviceActionModelSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -266,30 +376,7 @@ def device_lock(request, device_id):
     """
     Lock a specific device
     """
-    device = get_object_or_404(Device, device_id=device_id)
-    
-    # Check permissions
-    if request.user.role not in ['superadmin', 'security', 'it_admin']:
-        return Response(
-            {'error': 'Insufficient permissions'}, 
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        reason = request.data.get('reason', 'Manual lock via API')
-        result = device.lock_screen(request.user, reason)
-        
-        return Response({
-            'success': True,
-            'message': 'Device lock command sent successfully',
-            'action_id': result.id,
-            'status': result.status
-        })
-    except Exception as e:
-        return Response(
-            {'error': str(e)}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _dispatch_device_action(request, device_id, 'lock', request.data.get('reason'))
 
 
 @api_view(['POST'])
@@ -298,30 +385,48 @@ def device_unlock(request, device_id):
     """
     Unlock a specific device
     """
-    device = get_object_or_404(Device, device_id=device_id)
+    return _dispatch_device_action(request, device_id, 'unlock', request.data.get('reason'))
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def device_bulk_action(request):
+    """
+    Lock or unlock several devices in one request
+    """
+    serializer = DeviceBulkActionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
     
-    # Check permissions
-    if request.user.role not in ['superadmin', 'security', 'it_admin']:
+    # Same capability as the single-device endpoint for this action
+    if not request.user.has_capability(DEVICE_ACTIONS[data['action']][1]):
         return Response(
             {'error': 'Insufficient permissions'}, 
             status=status.HTTP_403_FORBIDDEN
         )
     
-    try:
-        reason = request.data.get('reason', 'Manual unlock via API')
-        result = device.unlock_screen(request.user, reason)
-        
-        return Response({
-            'success': True,
-            'message': 'Device unlock command sent successfully',
-            'action_id': result.id,
-            'status': result.status
-        })
-    except Exception as e:
+    devices = list(Device.objects.filter(device_id__in=data['device_ids']))
+    found = {device.device_id for device in devices}
+    not_found = [str(device_id) for device_id in dict.fromkeys(data['device_ids']) if device_id not in found]
+    if not devices:
         return Response(
-            {'error': str(e)}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {'error': 'No matching devices', 'not_found': not_found},
+            status=status.HTTP_404_NOT_FOUND
         )
+    
+    if data['action'] == 'lock':
+        actions = Device.bulk_lock(devices, data.get('reason') or 'Bulk lock via API', request.user)
+    else:
+        actions = Device.bulk_unlock(devices, data.get('reason', ''), request.user)
+    
+    return Response({
+        'success': True,
+        'message': f"{data['action'].title()} command sent to {len(devices)} devices",
+        'action_ids': [action.id for action in actions],
+        'not_found': not_found,
+    })
 
 
 @api_view(['POST'])
@@ -330,30 +435,7 @@ def device_screenshot(request, device_id):
     """
     Take screenshot of a specific device
     """
-    device = get_object_or_404(Device, device_id=device_id)
-    
-    # Check permissions
-    if request.user.role not in ['superadmin', 'security', 'it_admin', 'auditor']:
-        return Response(
-            {'error': 'Insufficient permissions'}, 
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        reason = request.data.get('reason', 'Manual screenshot via API')
-        result = device.take_screenshot(request.user, reason)
-        
-        return Response({
-            'success': True,
-            'message': 'Screenshot command sent successfully',
-            'action_id': result.id,
-            'status': result.status
-        })
-    except Exception as e:
-        return Response(
-            {'error': str(e)}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _dispatch_device_action(request, device_id, 'screenshot', request.data.get('reason'))
 
 
 @api_view(['POST'])
@@ -362,30 +444,7 @@ def device_restart(request, device_id):
     """
     Restart a specific device
     """
-    device = get_object_or_404(Device, device_id=device_id)
-    
-    # Check permissions - only superadmin and it_admin can restart
-    if request.user.role not in ['superadmin', 'it_admin']:
-        return Response(
-            {'error': 'Insufficient permissions'}, 
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        reason = request.data.get('reason', 'Manual restart via API')
-        result = device.restart_device(request.user, reason)
-        
-        return Response({
-            'success': True,
-            'message': 'Device restart command sent successfully',
-            'action_id': result.id,
-            'status': result.status
-        })
-    except Exception as e:
-        return Response(
-            {'error': str(e)}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _dispatch_device_action(request, device_id, 'restart', request.data.get('reason'))
 
 
 @api_view(['GET'])
@@ -413,6 +472,14 @@ def device_detail_by_uuid(request, device_id):
     """
     Get device details by UUID
     """
-    device = get_object_or_404(Device, device_id=device_id)
-    serializer = DeviceSerializer(device)
-    return Response(serializer.data)
+    try:
+        device_pk = Device.pk_for_device_id(device_id)
+    except Device.DoesNotExist:
+        raise Http404
+    
+    def serialize():
+        device = get_object_or_404(Device.objects.with_online_flag().select_related('owner_user'), pk=device_pk)
+        return DeviceSerializer(device).data
+    
+    # Invalidated by Device saves, bulk actions and heartbeat writes (see Device.forget_cached_details)
+    return Response(cache.get_or_set(Device.detail_cache_key(device_pk), serialize, DEVICE_DETAIL_TIMEOUT))
@@ -0,0 +1,212 @@
+import atexit
+import csv
+import io
+import json
+import logging
+import threading
+
+from django.db import IntegrityError, connection, connections, models, transaction
+
+from devices.models import Device
+
+from .models import DeviceHeartbeat, Event
+
+
+logger = logging.getLogger('webadmin')
+
+# Flush buffered heartbeat rows once this many are queued ...
+HEARTBEAT_FLUSH_SIZE = 500
+# ... or once the oldest queued row is this many seconds old
+HEARTBEAT_FLUSH_INTERVAL = 2
+
+# Same thresholds for standalone audit events queued through log_event()
+EVENT_FLUSH_SIZE = 5000
+EVENT_FLUSH_INTERVAL = 1
+
+
+# Columns written by COPY, in order; NULL is spelled \N so empty strings survive
+HEARTBEAT_COPY_COLUMNS = [
+    'device_id', 'timestamp', 'status', 'is_locked', 'cpu_usage',
+    'memory_usage', 'disk_usage', 'agent_version', 'metadata',
+]
+HEARTBEAT_COPY_SQL = (
+    f"COPY {DeviceHeartbeat._meta.db_table} ({', '.join(HEARTBEAT_COPY_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+)
+
+
+def _copy_heartbeats(rows):
+    """
+    Append heartbeat rows with PostgreSQL COPY (psycopg2 or psycopg 3)
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for hb in rows:
+        writer.writerow([
+            '\\N' if value is None else value
+            for value in (
+                hb.device_id, hb.timestamp.isoformat(), hb.status, hb.is_locked, hb.cpu_usage,
+                hb.memory_usage, hb.disk_usage, hb.agent_version, json.dumps(hb.metadata),
+            )
+        ])
+    buf.seek(0)
+    with connection.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):
+            cursor.copy_expert(HEARTBEAT_COPY_SQL, buf)
+        else:
+            with cursor.copy(HEARTBEAT_COPY_SQL) as copy:
+                copy.write(buf.getvalue())
+
+
+class ModelBuffer:
+    """
+    Per-process buffer that writes rows of one model in batches.
+
+    Rows carry their own timestamps, so batching only delays when they become
+    visible. A batch is written by the add() that crosses the size threshold,
+    by a one-shot timer once the oldest queued row reaches max_age, and at
+    interpreter exit.
+    """
+    def __init__(self, model, max_rows, max_age):
+        self.model = model
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self._rows = []
+        self._lock = threading.Lock()
+
+    def add(self, obj):
+        with self._lock:
+            if not self._rows:
+                timer = threading.Timer(self.max_age, self._flush_from_timer)
+                timer.daemon = True
+                timer.start()
+            self._rows.append(obj)
+            due = len(self._rows) >= self.max_rows
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            try:
+                self._write_atomic(rows)
+            except IntegrityError:
+                # Usually a referenced device or user was deleted while its rows
+                # were queued; keep the rest of the batch
+                kept = self.drop_orphans(rows)
+                if len(kept) < len(rows):
+                    logger.warning(
+                        "Dropped %d buffered %s rows referencing deleted records",
+                        len(rows) - len(kept), self.model._meta.model_name
+                    )
+                rows = kept
+                if rows:
+                    self._write_atomic(rows)
+        except Exception:
+            logger.exception("Dropped %d buffered %s rows", len(rows), self.model._meta.model_name)
+            return 0
+        return len(rows)
+
+    def _write_atomic(self, rows):
+        # Outside a request transaction, deferred FK checks fire on this commit,
+        # so a failure surfaces here rather than in unrelated later work
+        with transaction.atomic():
+            self.write(rows)
+
+    def drop_orphans(self, rows):
+        """
+        Rows whose foreign keys still resolve, with one lookup per relation.
+
+        References to deleted rows are cleared on SET_NULL relations (as the
+        delete would have done); otherwise the row is dropped.
+        """
+        for field in self.model._meta.concrete_fields:
+            if not field.is_relation:
+                continue
+            ids = {getattr(row, field.attname) for row in rows} - {None}
+            if not ids:
+                continue
+            target = field.target_field.attname
+            existing = set(field.related_model._base_manager.filter(
+                **{f'{target}__in': ids}
+            ).values_list(target, flat=True))
+            if field.remote_field.on_delete is models.SET_NULL:
+                for row in rows:
+                    if getattr(row, field.attname) not in existing:
+                        setattr(row, field.attname, None)
+            else:
+                rows = [
+                    row for row in rows
+                    if getattr(row, field.attname) is None or getattr(row, field.attname) in existing
+                ]
+        return rows
+
+    def write(self, rows):
+        self.model.objects.bulk_create(rows, batch_size=self.max_rows)
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own connection; don't leave it behind
+            connections.close_all()
+
+
+class HeartbeatBuffer(ModelBuffer):
+    """
+    DeviceHeartbeat buffer; PostgreSQL batches go through COPY
+    """
+    def __init__(self, max_rows=HEARTBEAT_FLUSH_SIZE, max_age=HEARTBEAT_FLUSH_INTERVAL):
+        super().__init__(DeviceHeartbeat, max_rows, max_age)
+
+    def write(self, rows):
+        if connection.vendor == 'postgresql':
+            _copy_heartbeats(rows)
+        else:
+            super().write(rows)
+
+
+class DeviceStateBuffer(ModelBuffer):
+    """
+    Device last_seen/status/is_locked updates from heartbeats.
+
+    Rows are (pk, status, is_locked, seen_at) tuples; each flush keeps the
+    state with the newest seen_at per device and writes it with
+    Device.record_heartbeats.
+    """
+    def __init__(self, max_rows=HEARTBEAT_FLUSH_SIZE, max_age=HEARTBEAT_FLUSH_INTERVAL):
+        super().__init__(Device, max_rows, max_age)
+
+    def write(self, rows):
+        latest = {}
+        for pk, status, is_locked, seen_at in rows:
+            # Threads can queue beats slightly out of order; go by receive time
+            if pk not in latest or seen_at >= latest[pk][2]:
+                latest[pk] = (status, is_locked, seen_at)
+        self.model.record_heartbeats(latest)
+
+
+heartbeat_buffer = HeartbeatBuffer()
+device_state_buffer = DeviceStateBuffer()
+event_buffer = ModelBuffer(Event, EVENT_FLUSH_SIZE, EVENT_FLUSH_INTERVAL)
+
+for _buffer in (heartbeat_buffer, device_state_buffer, event_buffer):
+    atexit.register(_buffer.flush)
+
+
+def log_event(**fields):
+    """
+    Queue an Event row for a batched insert instead of writing it on the request path.
+
+    Use for standalone audit rows only; events that must commit together with
+    other writes should keep using Event.objects.create inside the transaction.
+
+    Queued events live in process memory for up to EVENT_FLUSH_INTERVAL seconds.
+    They are written at normal interpreter exit, but are lost if the process is
+    killed (SIGKILL, OOM, crash) before the next flush. Events whose device was
+    deleted in the meantime are dropped on flush; a deleted user is cleared.
+    """
+    event_buffer.add(Event(**fields))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0003_device_devices_last_se_fa6fa4_idx_and_more'),
+        ('events', '0002_alter_event_event_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-timestamp', 'severity'], name='events_timesta_49bae2_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0003_device_devices_last_se_fa6fa4_idx_and_more'),
+        ('events', '0003_event_events_timesta_49bae2_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='securityincident',
+            index=models.Index(fields=['-created_at', 'severity', 'status'], name='security_in_created_958d32_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_securityincident_security_in_created_958d32_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deviceheartbeat',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_alter_deviceheartbeat_timestamp'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Event timestamp'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 import uuid
 
@@ -85,8 +86,10 @@ class Event(models.Model):
         related_name='events',
         help_text=_('User associated with event')
     )
+    # Stamped on creation, not when a buffered batch is written (see events.buffers)
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         help_text=_('Event timestamp')
     )
     severity = models.CharField(
@@ -124,6 +127,7 @@ class Event(models.Model):
         verbose_name_plural = _('Events')
         ordering = ['-timestamp']
         indexes = [
+            models.Index(fields=['-timestamp', 'severity']),
             models.Index(fields=['event_type', '-timestamp']),
             models.Index(fields=['device', '-timestamp']),
             models.Index(fields=['user', '-timestamp']),
@@ -210,7 +214,8 @@ class DeviceHeartbeat(models.Model):
         on_delete=models.CASCADE,
         related_name='heartbeats'
     )
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Stamped when the heartbeat is received, not when a buffered batch is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     status = models.CharField(
         max_length=20,
         default='online'
@@ -310,6 +315,9 @@ class SecurityIncident(models.Model):
         verbose_name = _('Security Incident')
         verbose_name_plural = _('Security Incidents')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'severity', 'status']),
+        ]
     
     def __str__(self):
         return f"{self.incident_id}: {self.title} ({self.get_status_display()})"
@@ -20,6 +20,22 @@ class EventSerializer(serializers.ModelSerializer):
         read_only_fields = ['event_id', 'timestamp']
 
 
+class EventListSerializer(serializers.ModelSerializer):
+    """
+    Slim event serializer for list responses (no metadata, user_agent or nested device/user)
+    """
+    device_name = serializers.CharField(source='device.name', read_only=True, default=None)
+    username = serializers.CharField(source='user.username', read_only=True, default=None)
+    
+    class Meta:
+        model = Event
+        fields = [
+            'event_id', 'event_type', 'device_id', 'device_name', 'user_id', 'username',
+            'timestamp', 'severity', 'message', 'ip_address', 'source'
+        ]
+        read_only_fields = fields
+
+
 class UnlockAttemptSerializer(serializers.ModelSerializer):
     """
     Unlock attempt serializer
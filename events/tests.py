@@ -1,3 +1,77 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from authentication.models import User
+from devices.models import Device
+from .buffers import DeviceStateBuffer, HeartbeatBuffer, ModelBuffer
+from .models import DeviceHeartbeat, Event
+
+
+def make_device(name):
+    return Device.objects.create(name=name, hostname=f'{name}-host')
+
+
+class HeartbeatBufferTests(TransactionTestCase):
+    """
+    Flush thresholds and failure handling of the per-process write buffers
+    """
+    def test_flushes_when_size_threshold_is_crossed(self):
+        device = make_device('size')
+        buffer = HeartbeatBuffer(max_rows=3, max_age=60)
+        
+        buffer.add(DeviceHeartbeat(device_id=device.pk))
+        buffer.add(DeviceHeartbeat(device_id=device.pk))
+        self.assertEqual(DeviceHeartbeat.objects.count(), 0)
+        
+        buffer.add(DeviceHeartbeat(device_id=device.pk))
+        self.assertEqual(DeviceHeartbeat.objects.count(), 3)
+    
+    def test_timer_flushes_once_oldest_row_reaches_max_age(self):
+        device = make_device('timer')
+        buffer = HeartbeatBuffer(max_rows=100, max_age=0.05)
+        
+        buffer.add(DeviceHeartbeat(device_id=device.pk))
+        deadline = time.monotonic() + 5
+        while not DeviceHeartbeat.objects.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        
+        self.assertEqual(DeviceHeartbeat.objects.count(), 1)
+    
+    def test_rows_for_deleted_device_do_not_sink_the_batch(self):
+        kept, deleted = make_device('kept'), make_device('deleted')
+        buffer = HeartbeatBuffer(max_rows=100, max_age=60)
+        buffer.add(DeviceHeartbeat(device_id=kept.pk))
+        buffer.add(DeviceHeartbeat(device_id=deleted.pk))
+        deleted.delete()
+        
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(list(DeviceHeartbeat.objects.values_list('device_id', flat=True)), [kept.pk])
+    
+    def test_events_keep_their_row_when_user_is_deleted(self):
+        device = make_device('audit')
+        user = User.objects.create(username='gone')
+        buffer = ModelBuffer(Event, 100, 60)
+        buffer.add(Event(device_id=device.pk, user_id=user.pk, event_type='admin_action', message='kept'))
+        buffer.add(Event(device_id=device.pk, event_type='admin_action', message='also kept'))
+        user.delete()
+        
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(Event.objects.filter(user__isnull=True).count(), 2)
+
+
+class DeviceStateBufferTests(TransactionTestCase):
+    def test_latest_state_per_device_wins(self):
+        device = make_device('state')
+        now = timezone.now()
+        buffer = DeviceStateBuffer(max_rows=100, max_age=60)
+        
+        # Queued out of order: the newest beat (locked) must be the one applied
+        buffer.add((device.pk, 'locked', True, now))
+        buffer.add((device.pk, 'online', False, now - timedelta(seconds=1)))
+        buffer.flush()
+        
+        device.refresh_from_db()
+        self.assertEqual((device.status, device.is_locked, device.last_seen), ('locked', True, now))
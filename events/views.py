@@ -1,23 +1,57 @@
+from django.db.models import Prefetch
 from rest_framework import generics, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from .models import Event, UnlockAttempt, DeviceHeartbeat, SecurityIncident
 from .serializers import (
-    EventSerializer, UnlockAttemptSerializer, DeviceHeartbeatSerializer,
+    EventSerializer, EventListSerializer, UnlockAttemptSerializer, DeviceHeartbeatSerializer,
     SecurityIncidentSerializer
 )
 
+# Columns rendered by EventListSerializer
+EVENT_LIST_FIELDS = (
+    'event_id', 'event_type', 'device_id', 'device__name', 'user_id', 'user__username',
+    'timestamp', 'severity', 'message', 'ip_address', 'source'
+)
+
+
+class TimestampCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the event and heartbeat lists (avoids deep OFFSET scans)
+    """
+    page_size = 50
+    ordering = ('-timestamp', '-id')
+
+
+def _event_queryset():
+    """
+    Events with the device, device owner and user rows EventSerializer nests
+    """
+    return Event.objects.select_related('device__owner_user', 'user')
+
+
+def _incident_queryset():
+    """
+    Security incidents with every relation SecurityIncidentSerializer nests
+    """
+    return SecurityIncident.objects.select_related(
+        'device__owner_user', 'reported_by', 'assigned_to'
+    ).prefetch_related(
+        Prefetch('related_events', queryset=_event_queryset())
+    )
+
 
 class EventListView(generics.ListAPIView):
     """
     List all events with filtering
     """
-    queryset = Event.objects.all()
-    serializer_class = EventSerializer
+    serializer_class = EventListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TimestampCursorPagination
     
     def get_queryset(self):
-        queryset = Event.objects.all()
+        queryset = Event.objects.select_related('device', 'user').only(*EVENT_LIST_FIELDS)
         
         # Filter by event type
         event_type = self.request.query_params.get('event_type')
@@ -41,7 +75,7 @@ class EventDetailView(generics.RetrieveAPIView):
     """
     Retrieve a specific event
     """
-    queryset = Event.objects.all()
+    queryset = _event_queryset()
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'event_id'
@@ -51,7 +85,7 @@ class UnlockAttemptListView(generics.ListAPIView):
     """
     List all unlock attempts
     """
-    queryset = UnlockAttempt.objects.all()
+    queryset = UnlockAttempt.objects.select_related('device__owner_user', 'unlock_user')
     serializer_class = UnlockAttemptSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -60,7 +94,7 @@ class UnlockAttemptDetailView(generics.RetrieveAPIView):
     """
     Retrieve a specific unlock attempt
     """
-    queryset = UnlockAttempt.objects.all()
+    queryset = UnlockAttempt.objects.select_related('device__owner_user', 'unlock_user')
     serializer_class = UnlockAttemptSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -69,16 +103,17 @@ class DeviceHeartbeatListView(generics.ListAPIView):
     """
     List device heartbeats
     """
-    queryset = DeviceHeartbeat.objects.all()
+    queryset = DeviceHeartbeat.objects.select_related('device__owner_user')
     serializer_class = DeviceHeartbeatSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TimestampCursorPagination
 
 
 class DeviceHeartbeatDetailView(generics.RetrieveAPIView):
     """
     Retrieve a specific heartbeat
     """
-    queryset = DeviceHeartbeat.objects.all()
+    queryset = DeviceHeartbeat.objects.select_related('device__owner_user')
     serializer_class = DeviceHeartbeatSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -87,7 +122,7 @@ class SecurityIncidentListCreateView(generics.ListCreateAPIView):
     """
     List all security incidents or create a new incident
     """
-    queryset = SecurityIncident.objects.all()
+    queryset = _incident_queryset()
     serializer_class = SecurityIncidentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -96,7 +131,7 @@ class SecurityIncidentDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a security incident
     """
-    queryset = SecurityIncident.objects.all()
+    queryset = _incident_queryset()
     serializer_class = SecurityIncidentSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'incident_id'
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forensics', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp', '-log_id'], name='audit_logs_timesta_37b0d1_idx'),
+        ),
+    ]
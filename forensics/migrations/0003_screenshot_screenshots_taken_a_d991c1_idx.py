@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0003_device_devices_last_se_fa6fa4_idx_and_more'),
+        ('events', '0004_securityincident_security_in_created_958d32_idx'),
+        ('forensics', '0002_auditlog_audit_logs_timesta_37b0d1_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='screenshot',
+            index=models.Index(fields=['-taken_at', 'device'], name='screenshots_taken_a_d991c1_idx'),
+        ),
+    ]
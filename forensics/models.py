@@ -86,6 +86,7 @@ class Screenshot(models.Model):
         verbose_name_plural = _('Screenshots')
         ordering = ['-taken_at']
         indexes = [
+            models.Index(fields=['-taken_at', 'device']),
             models.Index(fields=['device', '-taken_at']),
             models.Index(fields=['event', '-taken_at']),
         ]
@@ -214,6 +215,7 @@ class AuditLog(models.Model):
         verbose_name_plural = _('Audit Logs')
         ordering = ['-timestamp']
         indexes = [
+            models.Index(fields=['-timestamp', '-log_id']),
             models.Index(fields=['actor_user', '-timestamp']),
             models.Index(fields=['action', '-timestamp']),
             models.Index(fields=['target', '-timestamp']),
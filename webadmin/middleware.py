@@ -0,0 +1,68 @@
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+
+logger = logging.getLogger('webadmin')
+
+
+class RepeatedQueryError(ImproperlyConfigured):
+    """
+    Raised in strict mode when a request repeats the same SQL statement too often
+    """
+
+
+class RepeatedQueryMiddleware:
+    """
+    Development guard against N+1 lazy loads.
+
+    Counts the SQL templates (placeholders, not parameters) executed while
+    handling a request. A template run more than QUERY_REPEAT_THRESHOLD times
+    almost always means a relation is being loaded per row; it is logged, or
+    raised when QUERY_REPEAT_STRICT is set so test runs fail on the regression.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'QUERY_REPEAT_THRESHOLD', 10)
+        self.strict = getattr(settings, 'QUERY_REPEAT_STRICT', False)
+
+    def __call__(self, request):
+        statements = Counter()
+
+        def count_query(execute, sql, params, many, context):
+            statements[sql] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+
+        repeated = [(sql, n) for sql, n in statements.items() if n > self.threshold]
+        for sql, n in repeated:
+            message = f"{request.method} {request.path} ran the same query {n} times: {sql[:200]}"
+            if self.strict:
+                raise RepeatedQueryError(message)
+            logger.warning(message)
+
+        return response
+
+
+class ClientIPMiddleware:
+    """
+    Resolve the client address once per request as request.client_ip.
+
+    Uses the first X-Forwarded-For entry when present (set by the reverse
+    proxy), falling back to REMOTE_ADDR.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded_for:
+            request.client_ip = forwarded_for.partition(',')[0].strip()
+        else:
+            request.client_ip = request.META.get('REMOTE_ADDR')
+        return self.get_response(request)